@@ -0,0 +1,480 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Automated University Grade Report Generator
+TASK: 02 (Cohort analytics - percentiles, ranks, per-section stats)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Reads score exports as CSV, Parquet, Feather/Arrow IPC or a memory-mapped
+NumPy structured array (.npy) and computes every cohort statistic in ONE
+pass over the data:
+  - per-subject and per-section distributions (mean, std, percentiles)
+  - pass rates, grade counts and 10-mark histograms
+  - dense ranks (rank lookup tables + top performers per section)
+
+Each mark column is kept as an exact count table at 0.01 resolution
+(10,001 counters per section), so percentiles and ranks need no sorting
+and memory does not grow with the number of students.
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from pdf_report_gen import (CHUNK_SIZE, CSV_FILE, GRADE_BOUNDARIES, FAIL_GRADE, ID_DTYPES,
+                            MARK_DTYPE, OUTPUT_FILENAME, PASS_MARK, SUBJECTS, analyze_data,
+                            generate_pdf)
+
+# --- CONFIGURATION ---
+SECTION_COLUMN = "Section"   # Optional column; files without it form one section
+ALL_SECTIONS = "All"
+SCALE = 100                  # Marks are counted at 0.01 resolution
+MAX_MARK = 100
+BINS = MAX_MARK * SCALE + 1
+PERCENTILES = [10, 25, 50, 75, 90]
+HISTOGRAM_EDGES = list(range(0, MAX_MARK + 1, 10))   # 0-9, 10-19, ..., 90-100
+TOP_K = 3                    # Top performers listed per section
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".feather": "arrow",
+           ".arrow": "arrow", ".ipc": "arrow", ".npy": "npy"}
+
+# --- INGEST ---
+def detect_format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported score file: {path} (use {', '.join(sorted(FORMATS))})")
+    return fmt
+
+def _normalize(df, subjects):
+    """
+    Same column set and dtypes whatever the source format was.
+    """
+    df = df.astype({**ID_DTYPES, **{subject: MARK_DTYPE for subject in subjects}})
+    if SECTION_COLUMN in df:
+        df[SECTION_COLUMN] = df[SECTION_COLUMN].astype("string").fillna(ALL_SECTIONS)
+    return df.reset_index(drop=True)
+
+def read_batches(path, subjects=SUBJECTS, chunksize=CHUNK_SIZE):
+    """
+    Streams a score file as DataFrame chunks of at most `chunksize` rows.
+    Columnar formats are memory-mapped and only the needed columns are read.
+    """
+    wanted = list(ID_DTYPES) + subjects
+    fmt = detect_format(path)
+
+    if fmt == "csv":
+        header = pd.read_csv(path, nrows=0).columns
+        columns = wanted + [SECTION_COLUMN] * (SECTION_COLUMN in header)
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize,
+                                 dtype={SECTION_COLUMN: "string"}):
+            yield _normalize(chunk, subjects)
+
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        source = pq.ParquetFile(path, memory_map=True)
+        columns = wanted + [SECTION_COLUMN] * (SECTION_COLUMN in source.schema_arrow.names)
+        for batch in source.iter_batches(batch_size=chunksize, columns=columns):
+            yield _normalize(batch.to_pandas(), subjects)
+
+    elif fmt == "arrow":
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            columns = wanted + [SECTION_COLUMN] * (SECTION_COLUMN in reader.schema.names)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select(columns)
+                for start in range(0, batch.num_rows, chunksize):   # Zero-copy slices
+                    yield _normalize(batch.slice(start, chunksize).to_pandas(), subjects)
+
+    else:
+        # Structured array with one field per column, e.g. dtype
+        # [("RollNo", "i8"), ("Name", "U40"), ("Section", "U8"), ("Maths", "f4"), ...]
+        array = np.load(path, mmap_mode="r")
+        names = array.dtype.names or ()
+        missing = [column for column in wanted if column not in names]
+        if missing:
+            raise ValueError(f"{path} has no field(s) {missing}")
+        columns = wanted + [SECTION_COLUMN] * (SECTION_COLUMN in names)
+        for start in range(0, len(array), chunksize):
+            rows = array[start:start + chunksize]
+            yield _normalize(pd.DataFrame({column: rows[column] for column in columns}),
+                             subjects)
+
+def convert(csv_file, output, chunksize=CHUNK_SIZE):
+    """
+    One-off CSV → Parquet/Feather conversion, streamed chunk by chunk.
+    """
+    import pyarrow as pa
+    fmt = detect_format(output)
+    if fmt not in ("parquet", "arrow"):
+        raise ValueError("convert() writes .parquet or .feather/.arrow files")
+
+    writer = None
+    try:
+        for chunk in read_batches(csv_file, chunksize=chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                if fmt == "parquet":
+                    import pyarrow.parquet as pq
+                    writer = pq.ParquetWriter(output, table.schema)
+                else:
+                    writer = pa.ipc.new_file(output, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+# --- ONE-PASS STATISTICS ---
+def _quantize(values):
+    """
+    Marks → count-table index. The small epsilon absorbs float32 noise
+    (85.1 is stored as 85.0999...) while averages just below a boundary
+    (39.9967) still land below it.
+    """
+    return np.clip(np.floor(values * SCALE + 1e-3), 0, BINS - 1).astype(np.int64)
+
+class CohortStats:
+    """
+    Per-section count tables for every subject and the average, updated chunk
+    by chunk. All statistics (percentiles, pass rates, histograms, dense ranks)
+    are read off the tables, so one pass over the data is enough.
+    """
+    def __init__(self, subjects=SUBJECTS, pass_mark=PASS_MARK, boundaries=GRADE_BOUNDARIES,
+                 top_k=TOP_K):
+        self.subjects = subjects
+        self.metrics = subjects + ["Average"]
+        self.pass_mark = pass_mark
+        self.boundaries = boundaries
+        self.top_k = top_k
+        self.sections = {}    # section name → row in the count tables
+        self.counts = {metric: np.zeros((0, BINS), np.int64) for metric in self.metrics}
+        self.missing = {metric: np.zeros(0, np.int64) for metric in self.metrics}
+        self.students = np.zeros(0, np.int64)
+        self.top = None       # Best `top_k` students per section seen so far
+
+    def _section_codes(self, df):
+        if SECTION_COLUMN not in df:
+            labels = pd.Index([ALL_SECTIONS])
+            codes = np.zeros(len(df), np.int64)
+        else:
+            codes, labels = pd.factorize(df[SECTION_COLUMN])
+        new = [label for label in labels if label not in self.sections]
+        for label in new:
+            self.sections[label] = len(self.sections)
+        if new:
+            grow = len(new)
+            for metric in self.metrics:
+                self.counts[metric] = np.vstack([self.counts[metric],
+                                                 np.zeros((grow, BINS), np.int64)])
+                self.missing[metric] = np.concatenate([self.missing[metric],
+                                                       np.zeros(grow, np.int64)])
+            self.students = np.concatenate([self.students, np.zeros(grow, np.int64)])
+        lookup = np.array([self.sections[label] for label in labels], np.int64)
+        return lookup[codes]
+
+    def update(self, df):
+        """
+        Adds one analyzed chunk (needs the Average column from analyze_data).
+        """
+        codes = self._section_codes(df)
+        n_sections = len(self.sections)
+        self.students += np.bincount(codes, minlength=n_sections)
+
+        for metric in self.metrics:
+            values = df[metric].to_numpy(dtype="float64", na_value=np.nan)
+            present = ~np.isnan(values)
+            flat = codes[present] * BINS + _quantize(values[present])
+            self.counts[metric] += np.bincount(flat, minlength=n_sections * BINS).reshape(
+                n_sections, BINS)
+            self.missing[metric] += np.bincount(codes[~present], minlength=n_sections)
+
+        # Top performers: keep only top_k per section from (previous best + this chunk)
+        section = (df[SECTION_COLUMN] if SECTION_COLUMN in df
+                   else pd.Series(ALL_SECTIONS, index=df.index, dtype="string"))
+        candidates = pd.DataFrame({"Section": section, "RollNo": df['RollNo'],
+                                   "Name": df['Name'], "Average": df['Average']}).dropna(
+                                       subset=["Average"])
+        if self.top is not None:
+            candidates = pd.concat([self.top, candidates], ignore_index=True)
+        self.top = (candidates.sort_values("Average", ascending=False, kind="stable")
+                    .groupby("Section", sort=False).head(self.top_k).reset_index(drop=True))
+        return self
+
+    # --- READING THE TABLES ---
+    def table(self, metric, section=None):
+        """
+        Count table of one section, or all sections combined (section=None).
+        """
+        counts = self.counts[metric]
+        return counts.sum(axis=0) if section is None else counts[self.sections[section]]
+
+    def describe(self, metric, section=None):
+        counts = self.table(metric, section)
+        n = int(counts.sum())
+        if n == 0:
+            return {"count": 0}
+        values = np.arange(BINS) / SCALE
+        mean = float(counts @ values) / n
+        std = math.sqrt(max(float(counts @ (values - mean) ** 2) / n, 0.0))
+        cumulative = np.cumsum(counts)
+        occupied = np.flatnonzero(counts)
+
+        def percentile(q):   # Nearest-rank method
+            return float(np.searchsorted(cumulative, max(1, math.ceil(q / 100 * n)))) / SCALE
+
+        histogram = [int(counts[low * SCALE:high * SCALE + (high == MAX_MARK)].sum())
+                     for low, high in zip(HISTOGRAM_EDGES, HISTOGRAM_EDGES[1:])]
+        return {
+            "count": n,
+            "missing": int(self.missing[metric].sum() if section is None
+                           else self.missing[metric][self.sections[section]]),
+            "mean": round(mean, 2),
+            "std": round(std, 2),
+            "min": occupied[0] / SCALE,
+            "max": occupied[-1] / SCALE,
+            "percentiles": {f"p{q}": percentile(q) for q in PERCENTILES},
+            "pass_rate": round(float(counts[int(self.pass_mark * SCALE):].sum()) / n, 4),
+            "histogram": histogram,
+        }
+
+    def grade_counts(self, section=None):
+        counts = self.table("Average", section)
+        result, upper = {}, BINS
+        for low, grade in self.boundaries:
+            result[grade] = int(counts[int(low * SCALE):upper].sum())
+            upper = int(low * SCALE)
+        result[FAIL_GRADE] = int(counts[:upper].sum()) + int(
+            self.missing["Average"].sum() if section is None
+            else self.missing["Average"][self.sections[section]])
+        return result
+
+    def rank_table(self, metric="Average", section=None):
+        """
+        Dense rank for every possible value: rank_table[index] = 1 + number of
+        distinct values strictly above it.
+        """
+        occupied = (self.table(metric, section) > 0).astype(np.int64)
+        above = np.cumsum(occupied[::-1])[::-1] - occupied
+        return above + 1
+
+    def dense_ranks(self, df, metric="Average", by_section=False):
+        """
+        Dense rank of every row of `df` within the whole cohort (or its section).
+        NaN values get rank 0.
+        """
+        values = df[metric].to_numpy(dtype="float64", na_value=np.nan)
+        present = ~np.isnan(values)
+        index = _quantize(np.where(present, values, 0))
+        ranks = np.zeros(len(df), np.int64)
+        if not by_section or SECTION_COLUMN not in df:
+            ranks[present] = self.rank_table(metric)[index[present]]
+            return ranks
+        for section in self.sections:
+            mask = present & (df[SECTION_COLUMN] == section).to_numpy(dtype=bool, na_value=False)
+            ranks[mask] = self.rank_table(metric, section)[index[mask]]
+        return ranks
+
+    def top_performers(self):
+        """
+        Best students per section with their dense rank inside the section.
+        """
+        rows = []
+        for section in self.section_names():
+            best = self.top[self.top["Section"] == section]
+            ranks = self.rank_table("Average", section)
+            for student in best.itertuples(index=False):
+                rows.append({"Section": section, "Rank": int(ranks[_quantize(student.Average)]),
+                             "RollNo": int(student.RollNo), "Name": str(student.Name),
+                             "Average": round(float(student.Average), 2)})
+        return rows
+
+    def section_names(self):
+        return sorted(self.sections, key=str)
+
+    def summary(self):
+        return {
+            "students": int(self.students.sum()),
+            "pass_mark": self.pass_mark,
+            "subjects": {metric: self.describe(metric) for metric in self.metrics},
+            "grades": self.grade_counts(),
+            "sections": {section: {"students": int(self.students[self.sections[section]]),
+                                   "grades": self.grade_counts(section),
+                                   **{metric: self.describe(metric, section)
+                                      for metric in self.metrics}}
+                         for section in self.section_names()},
+            "top_performers": self.top_performers(),
+        }
+
+    # --- PDF SECTIONS ---
+    def write_sections(self, pdf):
+        """
+        Appends the cohort analytics pages to a PDFReport.
+        """
+        pdf.add_page()
+        pdf.set_text_color(0, 0, 0)
+        pdf.set_font("Arial", 'B', 14)
+        pdf.cell(0, 10, "Cohort Analytics", 0, 1)
+
+        # 1. Subject distributions (whole cohort)
+        _heading(pdf, "Subject Distributions (all sections)")
+        headers = ["Subject", "N", "Mean", "Std"] + [f"P{q}" for q in PERCENTILES] + ["Pass %"]
+        widths = [28, 18, 16, 16] + [16] * len(PERCENTILES) + [32]
+        rows = []
+        for metric in self.metrics:
+            stats = self.describe(metric)
+            if stats["count"]:
+                rows.append([metric, str(stats["count"]), f"{stats['mean']:.1f}",
+                             f"{stats['std']:.1f}"]
+                            + [f"{v:g}" for v in stats["percentiles"].values()]
+                            + [f"{stats['pass_rate'] * 100:.1f}"])
+        _table(pdf, headers, widths, rows)
+
+        # 2. Histogram of student averages
+        _heading(pdf, "Distribution of Student Averages")
+        stats = self.describe("Average")
+        if stats["count"]:
+            peak = max(stats["histogram"]) or 1
+            pdf.set_font("Arial", size=9)
+            pdf.set_fill_color(120, 160, 230)
+            for low, count in zip(HISTOGRAM_EDGES, stats["histogram"]):
+                label = f"{low}-{low + 9}" if low + 10 < MAX_MARK else f"{low}-{MAX_MARK}"
+                pdf.cell(20, 6, label, 0, 0, 'R')
+                x, y = pdf.get_x() + 2, pdf.get_y() + 1
+                width = 130 * count / peak
+                if width:
+                    pdf.rect(x, y, width, 4, 'F')
+                pdf.set_x(x + width + 2)
+                pdf.cell(0, 6, str(count), 0, 1)
+
+        # 3. Per-section summary
+        _heading(pdf, "Per-Section Summary")
+        headers = ["Section", "Students", "Mean", "Median", "P90", "Pass %", "Top Performer"]
+        widths = [22, 20, 18, 18, 18, 20, 74]
+        rows = []
+        best = {row["Section"]: row for row in reversed(self.top_performers())}
+        for section in self.section_names():
+            stats = self.describe("Average", section)
+            top = best.get(section)
+            rows.append([str(section), str(int(self.students[self.sections[section]])),
+                         f"{stats.get('mean', float('nan')):.1f}",
+                         f"{stats['percentiles']['p50']:g}" if stats["count"] else "-",
+                         f"{stats['percentiles']['p90']:g}" if stats["count"] else "-",
+                         f"{stats.get('pass_rate', 0) * 100:.1f}",
+                         f"{top['Name']} ({top['Average']:.1f}%)" if top else "-"])
+        _table(pdf, headers, widths, rows)
+
+        # 4. Grade counts per section
+        _heading(pdf, "Grade Distribution by Section")
+        grades = [grade for _, grade in self.boundaries] + [FAIL_GRADE]
+        headers = ["Section"] + grades
+        widths = [40] + [150 / len(grades)] * len(grades)
+        rows = [[str(section)] + [str(v) for v in self.grade_counts(section).values()]
+                for section in self.section_names()]
+        _table(pdf, headers, widths, rows)
+
+        # 5. Top performers (dense rank within section)
+        _heading(pdf, f"Top {self.top_k} Performers per Section (dense rank)")
+        headers = ["Section", "Rank", "Roll No", "Name", "Average"]
+        widths = [30, 20, 30, 80, 30]
+        rows = [[str(row["Section"]), str(row["Rank"]), str(row["RollNo"]), row["Name"],
+                 f"{row['Average']:.2f}"] for row in self.top_performers()]
+        _table(pdf, headers, widths, rows)
+
+def _heading(pdf, text):
+    pdf.ln(4)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(0, 8, text, 0, 1)
+
+def _table(pdf, headers, widths, rows, row_height=7):
+    """
+    Small bordered table; the header row is repeated after a page break.
+    """
+    def header_row():
+        pdf.set_font("Arial", 'B', 9)
+        pdf.set_fill_color(200, 220, 255) # Light Blue Background
+        for width, header in zip(widths, headers):
+            pdf.cell(width, row_height, header, 1, 0, 'C', fill=True)
+        pdf.ln()
+        pdf.set_font("Arial", size=9)
+
+    header_row()
+    for row in rows:
+        if pdf.get_y() + row_height > pdf.page_break_trigger:
+            pdf.add_page()
+            header_row()
+        for width, value in zip(widths, row):
+            pdf.cell(width, row_height, value, 1, 0, 'C')
+        pdf.ln()
+
+def analyze_file(path, chunksize=CHUNK_SIZE):
+    """
+    Analytics only (no student table): one streamed pass, returns CohortStats.
+    """
+    stats = CohortStats()
+    for chunk in read_batches(path, chunksize=chunksize):
+        stats.update(analyze_data(chunk))
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="One-pass cohort analytics for score exports")
+    parser.add_argument("--input", default=CSV_FILE,
+                        help="score file: .csv, .parquet, .feather/.arrow or structured .npy")
+    parser.add_argument("--pdf", nargs="?", const=OUTPUT_FILENAME, metavar="PATH",
+                        help=f"also build the class report with analytics pages "
+                             f"(default {OUTPUT_FILENAME})")
+    parser.add_argument("--json", metavar="PATH", help="write the statistics as JSON")
+    parser.add_argument("--ranked-csv", metavar="PATH",
+                        help="second pass: write graded rows with cohort + section dense ranks")
+    parser.add_argument("--convert", metavar="PATH",
+                        help="convert the CSV input to .parquet / .feather and exit")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE,
+                        help=f"rows per chunk (default {CHUNK_SIZE})")
+    args = parser.parse_args()
+
+    try:
+        if args.convert:
+            convert(args.input, args.convert, args.chunksize)
+            print(f"Converted {args.input} → {args.convert}")
+            return
+
+        started = time.perf_counter()
+        if args.pdf:
+            stats = CohortStats()
+            batches = (analyze_data(chunk)
+                       for chunk in read_batches(args.input, chunksize=args.chunksize))
+            generate_pdf(batches, args.pdf, cohort=stats)
+        else:
+            stats = analyze_file(args.input, args.chunksize)
+        elapsed = time.perf_counter() - started
+
+        summary = stats.summary()
+        average = summary["subjects"]["Average"]
+        print(f"{summary['students']} students, {len(summary['sections'])} section(s) "
+              f"in {elapsed:.2f} s")
+        if average["count"]:
+            print(f"Average {average['mean']:.2f}% | median {average['percentiles']['p50']:g} | "
+                  f"pass rate {average['pass_rate'] * 100:.1f}%")
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as file:
+                json.dump(summary, file, indent=2)
+            print(f"Statistics written to {args.json}")
+
+        if args.ranked_csv:
+            for i, chunk in enumerate(read_batches(args.input, chunksize=args.chunksize)):
+                graded = analyze_data(chunk)
+                graded['Rank'] = stats.dense_ranks(graded)
+                graded['SectionRank'] = stats.dense_ranks(graded, by_section=True)
+                graded.to_csv(args.ranked_csv, mode='w' if i == 0 else 'a', header=(i == 0),
+                              index=False)
+            print(f"Ranked rows written to {args.ranked_csv}")
+    except FileNotFoundError:
+        print(f"Error: Could not find {args.input}. Make sure it is in the same folder.")
+    except ValueError as error:
+        print(f"Error: {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Bulk offline triage classification)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Replays a message corpus (millions of lines) through the chatbot's own
+matcher (medicalbot.classify → the same ENGINE the live bot uses), so
+batch and interactive results agree exactly.
+
+  - streams the input; one message per line (.jsonl: the "user" field)
+  - classifies chunks of lines in a process pool (all cores)
+  - per-intent counts, fallback rate, most common fallback phrasings
+    (a bounded top-K: rare phrasings are pruned, so memory stays flat)
+  - optional labelled output: <intent>\\t<message>, in input order
+
+USAGE:  python batch_classify.py transcripts.txt --output labelled.tsv
+        python batch_classify.py session_log.jsonl --json coverage.json
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# --- CONFIGURATION ---
+CHUNK_LINES = 20_000     # Messages per pool task
+FALLBACK_INTENT = "fallback"
+TOP_FALLBACKS = 20
+TRACKED_FALLBACKS = 10_000   # Distinct fallback phrasings kept between chunks
+
+# --- WORKER SIDE ---
+def classify_chunk(messages):
+    """Pool task: (labels, per-intent counts, fallback phrasing counts) for one chunk."""
+    from medicalbot import classify   # Imported once per worker, ENGINE compiled there
+
+    labels = [classify(message) for message in messages]
+    fallbacks = Counter(message.strip().lower()
+                        for message, label in zip(messages, labels) if label == FALLBACK_INTENT)
+    return labels, Counter(labels), fallbacks
+
+# --- COORDINATOR SIDE ---
+def read_messages(path, chunk_lines=CHUNK_LINES):
+    """Streams the corpus as lists of messages (blank lines skipped)."""
+    is_jsonl = path.endswith(".jsonl")
+    chunk = []
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            if is_jsonl:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict):   # Valid JSON but not a log record
+                    continue
+                line = record.get("user")
+                if not isinstance(line, str):
+                    continue
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def prune(counts, keep):
+    """Cuts a Counter down to its `keep` most common entries, in place."""
+    top = counts.most_common(keep)
+    counts.clear()
+    counts.update(dict(top))
+
+def classify_corpus(path, output=None, workers=None, chunk_lines=CHUNK_LINES,
+                    tracked=TRACKED_FALLBACKS):
+    """Returns (intent counts, top `tracked` fallback phrasing counts, messages classified)."""
+    workers = workers or os.cpu_count() or 1
+    intents, fallbacks, total = Counter(), Counter(), 0
+    out = open(output, "w", encoding="utf-8") if output else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+
+            def collect():
+                nonlocal total
+                messages, future = pending.popleft()
+                labels, counts, fallback_counts = future.result()
+                intents.update(counts)
+                fallbacks.update(fallback_counts)
+                if len(fallbacks) > 2 * tracked:   # Amortized: prune only once it doubles
+                    prune(fallbacks, tracked)
+                total += len(labels)
+                if out:
+                    out.writelines(f"{label}\t{' '.join(message.split())}\n"   # One line each
+                                   for label, message in zip(labels, messages))
+
+            for messages in read_messages(path, chunk_lines):
+                pending.append((messages, pool.submit(classify_chunk, messages)))
+                if len(pending) >= workers * 2:   # Back-pressure, and keeps output in order
+                    collect()
+            while pending:
+                collect()
+    finally:
+        if out:
+            out.close()
+    prune(fallbacks, tracked)
+    return intents, fallbacks, total
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a message corpus with the triage bot")
+    parser.add_argument("input", help="text file (one message per line) or .jsonl log")
+    parser.add_argument("--output", help="labelled output (<intent>\\t<message>)")
+    parser.add_argument("--json", metavar="PATH", help="write counts + fallback rate as JSON")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=TOP_FALLBACKS,
+                        help=f"fallback phrasings to list (default {TOP_FALLBACKS})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        intents, fallbacks, total = classify_corpus(args.input, args.output, args.workers,
+                                                    tracked=max(TRACKED_FALLBACKS, args.top))
+    except FileNotFoundError:
+        print(f"Error: Could not find {args.input}.")
+        return
+    elapsed = time.perf_counter() - started
+
+    fallback_rate = intents[FALLBACK_INTENT] / total if total else 0.0
+    print(f"Classified {total:,} messages in {elapsed:.2f} s "
+          f"({total / max(elapsed, 1e-9):,.0f} msg/s)")
+    for intent, count in intents.most_common():
+        print(f"  {intent:<14} {count:>10,}  {count / total:6.1%}")
+    print(f"Fallback rate: {fallback_rate:.1%}")
+    if fallbacks:
+        print("Top fallback phrasings:")
+        for message, count in fallbacks.most_common(args.top):
+            print(f"  {count:>8,}  {message[:70]}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"messages": total, "intents": dict(intents.most_common()),
+                       "fallback_rate": round(fallback_rate, 6),
+                       "top_fallbacks": fallbacks.most_common(args.top)},
+                      file, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Buffered conversation logger)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Medical-record logging that never sits on the reply path:
+  - log() only puts a tuple on a queue (never blocks, never does I/O)
+  - a background thread batches records, writes JSON Lines, flushes
+    every FLUSH_INTERVAL and fsyncs every FSYNC_INTERVAL
+  - rotates by size or when the date changes, keeps BACKUPS old files
+  - close() (also run at exit) drains the queue and fsyncs
+
+One record per turn:
+  {"ts": "...", "session": "...", "intent": "...", "user": "...",
+   "bot": "...", "latency_ms": 0.012}
+"""
+
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# --- CONFIGURATION ---
+LOG_FILE = "session_log.jsonl"
+MAX_BYTES = 50 * 1024 * 1024   # Rotate when the file would grow past this
+BACKUPS = 10                   # Rotated files kept
+FLUSH_INTERVAL = 0.5           # Seconds a record may wait in the buffer
+FSYNC_INTERVAL = 2.0           # Seconds between fsyncs (durability vs. disk load)
+BATCH_SIZE = 512               # Records per write
+QUEUE_SIZE = 100_000           # Records buffered before new ones are dropped
+
+class ConversationLogger:
+    def __init__(self, path=LOG_FILE, max_bytes=MAX_BYTES, backups=BACKUPS, daily=True,
+                 flush_interval=FLUSH_INTERVAL, fsync_interval=FSYNC_INTERVAL,
+                 batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.daily = daily
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0              # Records lost because the queue was full
+        self.written = 0
+        self.closed = False
+        self.file = None
+        self.thread = threading.Thread(target=self._run, name="conversation-logger", daemon=True)
+        self.thread.start()
+
+    # --- PRODUCER SIDE (request path) ---
+    def log(self, user_input, bot_response, session=None, intent=None, latency_ms=None):
+        """Queues one turn; returns immediately (drops the record if the writer is far behind)."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait((time.time(), session, intent, user_input, bot_response,
+                                   latency_ms))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Drains everything still queued, fsyncs and stops the writer thread."""
+        if self.closed:
+            return
+        self.closed = True
+        deadline = time.monotonic() + timeout
+        try:
+            self.queue.put(None, timeout=timeout)   # Bounded: a dead writer can't hang exit
+        except queue.Full:
+            pass
+        self.thread.join(max(0.0, deadline - time.monotonic()))
+
+    # --- WRITER THREAD ---
+    def _run(self):
+        last_sync = time.monotonic()
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self.queue.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            if None in batch:   # close() was called
+                batch = [record for record in batch if record is not None]
+                running = False
+
+            if batch:
+                self._write(batch)
+            if self.file and (not running or time.monotonic() - last_sync >= self.fsync_interval):
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                last_sync = time.monotonic()
+        if self.file:
+            self.file.close()
+
+    def _write(self, batch):
+        lines, pending = [], 0
+        for ts, session, intent, user_input, bot_response, latency_ms in batch:
+            stamp = datetime.fromtimestamp(ts)
+            if self._needs_rotation(stamp.date()):
+                self._flush_lines(lines)
+                lines, pending = [], 0
+                self._rotate(stamp.date())
+            line = json.dumps({
+                "ts": stamp.isoformat(timespec="milliseconds"), "session": session,
+                "intent": intent, "user": user_input, "bot": bot_response,
+                "latency_ms": None if latency_ms is None else round(latency_ms, 3)},
+                ensure_ascii=False) + "\n"
+            size = len(line.encode("utf-8"))
+            written = self.file.tell() + pending
+            if written and written + size > self.max_bytes:   # Never rotate an empty file
+                self._flush_lines(lines)
+                lines, pending = [], 0
+                self._rotate(stamp.date())
+            lines.append(line)
+            pending += size
+        self._flush_lines(lines)
+
+    def _flush_lines(self, lines):
+        if lines:
+            self.file.write("".join(lines))
+            self.file.flush()
+            self.written += len(lines)
+
+    # --- ROTATION ---
+    def _open(self, date=None):
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.file_date = datetime.fromtimestamp(os.path.getmtime(self.path)).date() \
+            if self.file.tell() else (date or datetime.now().date())
+
+    def _needs_rotation(self, date):
+        if self.file is None:
+            self._open(date)
+        return self.daily and date != self.file_date and self.file.tell() > 0
+
+    def _rotate(self, date):
+        """session_log.jsonl → session_log.<timestamp>.jsonl, oldest beyond BACKUPS removed."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        stem, ext = os.path.splitext(self.path)
+        os.replace(self.path, f"{stem}.{datetime.now():%Y%m%d-%H%M%S-%f}{ext}")
+        for old in sorted(glob.glob(f"{glob.escape(stem)}.*{ext}"))[:-self.backups or None]:
+            os.remove(old)
+        self._open(date)
+
+# --- SHARED INSTANCE ---
+_logger = None
+_logger_lock = threading.Lock()
+
+def get_logger():
+    """Process-wide logger, started on first use and closed at exit."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = ConversationLogger()
+            atexit.register(_logger.close)
+        return _logger
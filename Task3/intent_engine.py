@@ -0,0 +1,322 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Compiled intent matcher)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Drop-in replacement for nltk's Chat.respond() pattern loop.
+
+nltk tries every `pairs` regex in order (`.*burn.*` scans the whole
+message once per pattern), so the cost per message grows with the size
+of the knowledge base. IntentEngine compiles all trigger words of all
+patterns into ONE Aho-Corasick automaton and resolves the winner in a
+single left-to-right scan of the message:
+
+  .*word.*     -> "message contains word"    (automaton, any position)
+  word         -> "message starts with word" (automaton, position 0)
+  (.*)  /  .*  -> fallback, always matches
+  anything else stays a regex and is tried in its original order
+
+The first pattern (in `pairs` order) that matches wins, exactly like nltk.
+
+Run `python intent_engine.py` for the micro-benchmark against nltk.
+"""
+
+import random
+import re
+import time
+
+META_CHARS = set(".^$*+?{}[]\\|()")
+FALLBACK_PATTERNS = {"(.*)", ".*", "(.*?)", ".*?"}
+
+# Same table as nltk.chat.util.reflections (kept here so the bots never import nltk -
+# `import nltk` alone takes over a second)
+REFLECTIONS = {
+    "i am": "you are", "i was": "you were", "i": "you", "i'm": "you are", "i'd": "you would",
+    "i've": "you have", "i'll": "you will", "my": "your", "you are": "I am", "you were": "I was",
+    "you've": "I have", "you'll": "I will", "your": "my", "yours": "mine", "you": "me",
+    "me": "you",
+}
+
+# --- AHO-CORASICK AUTOMATON ---
+class KeywordAutomaton:
+    """
+    All keywords in one trie with failure links; scan() is linear in the text.
+    Each state's row of the transition table (its own edges + its failure
+    state's row) is folded on first visit, so building and loading stay cheap
+    for thousands of keywords and the scan still costs one lookup per char.
+    """
+
+    def __init__(self):
+        self.goto = [{}]      # state → {char: next state}
+        self.fail = [0]
+        self.outputs = {}     # state → ((keyword length, payload), ...)
+
+    def add(self, keyword, payload):
+        state = 0
+        for char in keyword:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+            state = nxt
+        self.outputs[state] = self.outputs.get(state, ()) + ((len(keyword), payload),)
+
+    def build(self):
+        """Breadth-first pass that sets failure links and merges outputs."""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        queue = list(goto[0].values())
+        for state in queue:   # The list grows while we walk it (BFS order)
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                if fail[nxt] in outputs:
+                    outputs[nxt] = outputs.get(nxt, ()) + outputs[fail[nxt]]
+        self.delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        return self
+
+    def _row(self, state):
+        """Folded transitions of `state`, built the first time the scan reaches it."""
+        row = self.delta[state]
+        if row is None:
+            row = self.delta[state] = {**self._row(self.fail[state]), **self.goto[state]}
+        return row
+
+    def scan(self, text):
+        """Yields (start index, payload) for every keyword occurrence."""
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for i, char in enumerate(text):
+            row = delta[state]
+            state = (row if row is not None else self._row(state)).get(char, 0)
+            if state in outputs:
+                for length, payload in outputs[state]:
+                    yield i - length + 1, payload
+
+    def to_state(self):
+        return {"goto": self.goto, "fail": self.fail, "outputs": self.outputs}
+
+    @classmethod
+    def from_state(cls, state):
+        automaton = cls.__new__(cls)
+        automaton.goto, automaton.fail, automaton.outputs = (
+            state["goto"], state["fail"], state["outputs"])
+        automaton.delta = [dict(automaton.goto[0])] + [None] * (len(automaton.goto) - 1)
+        return automaton
+
+# --- PATTERN COMPILER ---
+def split_alternatives(pattern):
+    """Top-level `|` split (alternatives inside groups/classes stay together)."""
+    parts, depth, in_class, escaped, start = [], 0, False, False, 0
+    for i, char in enumerate(pattern):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+    parts.append(pattern[start:])
+    return parts
+
+def is_literal(text):
+    return bool(text) and not any(char in META_CHARS for char in text)
+
+def classify_alternative(alternative):
+    """('contains', word) | ('prefix', word) | ('fallback', None) | ('regex', alternative)"""
+    if alternative in FALLBACK_PATTERNS:
+        return "fallback", None
+    if alternative.startswith(".*") and alternative.endswith(".*"):
+        word = alternative[2:-2]
+        if is_literal(word):
+            return "contains", word.lower()
+    if is_literal(alternative):
+        return "prefix", alternative.lower()
+    return "regex", alternative
+
+class IntentEngine:
+    """
+    Compiled form of an nltk-style `pairs` list. match() returns the index of
+    the winning pattern, respond() returns a response like Chat.respond().
+    """
+
+    def __init__(self, pairs, reflections=None, labels=None):
+        self.pairs = [(pattern, list(responses)) for pattern, responses in pairs]
+        self.reflections = reflections or {}
+        self.regexes = {}              # index → full pattern, compiled on first use
+        self.labels = []
+        self.fallback = None           # First always-matching pattern
+        self.residual = []             # (index, compiled alternative) checked in order
+        self.automaton = KeywordAutomaton()
+
+        for index, (pattern, _) in enumerate(self.pairs):
+            kinds = [classify_alternative(alt) for alt in split_alternatives(pattern)]
+            self.labels.append(next((word for kind, word in kinds if word and kind != "regex"),
+                                    "fallback" if any(k == "fallback" for k, _ in kinds)
+                                    else pattern))
+            for kind, value in kinds:
+                if kind == "fallback":
+                    if self.fallback is None:
+                        self.fallback = index
+                elif kind == "regex":
+                    self.residual.append((index, re.compile(value, re.IGNORECASE)))
+                else:
+                    self.automaton.add(value, (index, kind == "prefix"))
+        self.automaton.build()
+        if labels is not None:
+            self.labels = list(labels)
+
+        if self.fallback is not None:
+            # Nothing after the fallback can ever win
+            self.residual = [(i, rx) for i, rx in self.residual if i < self.fallback]
+
+    def match(self, text):
+        """Index of the first pattern (in pairs order) matching `text`, or None."""
+        # `.` does not cross newlines and re.match anchors at the start, so
+        # nltk only ever looks at the first line of the message
+        line = text.split("\n", 1)[0].lower()
+        best = self.fallback
+        for start, (index, anchored) in self.automaton.scan(line):
+            if (best is None or index < best) and (start == 0 or not anchored):
+                best = index
+                if best == 0:
+                    break
+        for index, regex in self.residual:
+            if best is not None and index >= best:
+                break
+            if regex.match(text):
+                best = index
+                break
+        return best
+
+    def to_state(self):
+        """Plain data (str/int/list/dict/tuple) that from_state() rebuilds the engine from."""
+        return {"pairs": self.pairs, "reflections": self.reflections, "labels": self.labels,
+                "fallback": self.fallback,
+                "residual": [(index, regex.pattern) for index, regex in self.residual],
+                "automaton": self.automaton.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls.__new__(cls)
+        engine.pairs, engine.reflections = state["pairs"], state["reflections"]
+        engine.labels, engine.fallback = state["labels"], state["fallback"]
+        engine.residual = [(index, re.compile(pattern, re.IGNORECASE))
+                           for index, pattern in state["residual"]]
+        engine.regexes = {}
+        engine.automaton = KeywordAutomaton.from_state(state["automaton"])
+        return engine
+
+    def label(self, index):
+        return "none" if index is None else self.labels[index]
+
+    def respond(self, text):
+        """Same result as nltk Chat.respond() for the compiled pairs."""
+        return self.answer(text)[1]
+
+    def answer(self, text):
+        """(pattern index, response) - the index tells which intent fired."""
+        index = self.match(text)
+        if index is None:
+            return None, None
+        response = random.choice(self.pairs[index][1])
+        match = self.regex(index).match(text) if "%" in response else None
+        if match:   # Wildcard responses need the real regex groups
+            response = self._wildcards(response, match)
+        if response[-2:] == "?.":
+            response = response[:-2] + "."
+        if response[-2:] == "??":
+            response = response[:-2] + "?"
+        return index, response
+
+    def regex(self, index):
+        """Full pattern `index` as one regex - only wildcard (%1) responses need it."""
+        regex = self.regexes.get(index)
+        if regex is None:
+            regex = self.regexes[index] = re.compile(self.pairs[index][0], re.IGNORECASE)
+        return regex
+
+    def _wildcards(self, response, match):
+        """%1, %2 ... → reflected regex groups (same rules as nltk)."""
+        if not hasattr(self, "_reflection_regex"):
+            words = sorted(self.reflections, key=len, reverse=True)
+            self._reflection_regex = re.compile(
+                r"\b({})\b".format("|".join(map(re.escape, words))), re.IGNORECASE)
+
+        def reflect(group):
+            return self._reflection_regex.sub(
+                lambda m: self.reflections[m.group(0)], group.lower())
+        return re.sub(r"%(\d)", lambda m: reflect(match.group(int(m.group(1)))), response)
+
+# --- CONSOLE LOOP ---
+def converse(respond, quit="quit"):
+    """nltk's Chat.converse() loop: reads lines until `quit`, prints what respond() returns."""
+    user_input = ""
+    while user_input != quit:
+        user_input = quit
+        try:
+            user_input = input(">")
+        except EOFError:
+            print(user_input)
+        user_input = user_input.rstrip("!.")
+        if user_input:
+            result = respond(user_input)
+            if result is not None:
+                print(result)
+
+# --- MICRO-BENCHMARK ---
+def synthetic_pairs(count, seed=0):
+    """`count` keyword protocols + greeting + fallback, shaped like the bots' pairs."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    pairs = []
+    for i in range(count):
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(5, 9)))
+                 for _ in range(3)]
+        pairs.append(("|".join(f".*{word}.*" for word in words), [f"protocol {i}"]))
+    pairs.append((r"hi|hello|hey|help", ["greeting"]))
+    pairs.append((r"(.*)", ["fallback"]))
+    return pairs
+
+def benchmark(sizes=(8, 100, 500), messages=2000):
+    from nltk.chat.util import Chat
+
+    rng = random.Random(1)
+    filler = "my friend fell down the stairs and now there is a problem with his arm "
+    print(f"{'patterns':>9} {'msg len':>8} {'nltk us/msg':>12} {'engine us/msg':>14} {'speedup':>8}")
+    for size in sizes:
+        pairs = synthetic_pairs(size)
+        chat, engine = Chat(pairs), IntentEngine(pairs)
+        for length in (60, 1000):
+            texts = [(filler * (length // len(filler) + 1))[:length] for _ in range(messages)]
+            # A third of the messages hit a random protocol near the end of the list
+            for i in range(0, messages, 3):
+                word = split_alternatives(pairs[rng.randrange(size // 2, size)][0])[0][2:-2]
+                texts[i] = texts[i][:length // 2] + word + texts[i][length // 2:]
+            assert all(chat.respond(t) == engine.respond(t) for t in texts[:200])
+
+            timings = []
+            for respond in (chat.respond, engine.respond):
+                start = time.perf_counter()
+                for text in texts:
+                    respond(text)
+                timings.append((time.perf_counter() - start) / messages * 1e6)
+            print(f"{size:>9} {length:>8} {timings[0]:>12.1f} {timings[1]:>14.1f} "
+                  f"{timings[0] / timings[1]:>7.1f}x")
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,343 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Knowledge base index with typo-tolerant lookup)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Loads the triage protocols from knowledge_base.json (shared by both bots;
+"pro" = medicalbot wording, "classic" = medibot wording) and compiles them
+into a KnowledgeIndex:
+
+  - exact matching: the IntentEngine keyword automaton (same rules and
+    priority order as the old hardcoded `pairs` lists)
+  - typo tolerance: when nothing but the fallback matched, message words
+    are looked up in an inverted index of keyword words. Candidates come
+    from a symmetric-delete index (every keyword word with one letter
+    dropped), so a lookup costs a fixed number of dict probes however
+    large the knowledge base gets; they are then verified with a bounded
+    edit distance ("bleding" → bleeding, "chokng" → choking,
+    "anxeity" → anxiety)
+  - one typo at most, and only in words of 5+ letters that are not real
+    words themselves (knowledge-base text or english_words.txt, a word
+    frequency list), so "cooking", "blending" or "scaled" never turn into
+    an emergency protocol; the typo indexes are built the first time a
+    message needs them, not at startup
+  - the compiled index is cached next to the data file as plain marshal
+    data (dicts/lists/strings - nothing in it is ever executed), keyed by
+    the sha256 of knowledge_base.json and the Python version
+
+USAGE:  python kb_index.py "my son is bleding"      (which protocol fires?)
+        python kb_index.py --bench 3000             (lookup time vs KB size)
+        python kb_index.py --export-words           (regenerate english_words.txt,
+                                                     needs `pip install wordfreq`)
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import marshal
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from intent_engine import REFLECTIONS, IntentEngine, is_literal
+
+# --- CONFIGURATION ---
+KB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.json")
+CACHE_VERSION = 2          # Bump when the cached state changes shape
+MAX_TYPOS = 1
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+# Real English words (4+ letters, Zipf frequency >= MIN_ZIPF) - never "corrected"
+WORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "english_words.txt")
+MIN_ZIPF = 1.8   # ~60 uses per billion words: keeps "scarfed", drops misspellings ("panick")
+
+def max_edits(word):
+    """Typos tolerated for a keyword word: none below 5 letters, otherwise 1."""
+    return 0 if len(word) < 5 else MAX_TYPOS
+
+# --- REAL WORDS ---
+def load_words(path=WORDS_FILE):
+    """The real-word list as a set (lines starting with # are comments)."""
+    with open(path, encoding="utf-8") as file:
+        return {line.strip() for line in file if line.strip() and not line.startswith("#")}
+
+def export_words(path=WORDS_FILE, min_zipf=MIN_ZIPF):
+    """Writes english_words.txt from the wordfreq English frequency list."""
+    from importlib.metadata import version
+    import wordfreq
+
+    words = sorted(word for word in wordfreq.top_n_list("en", 1_000_000)
+                   if re.fullmatch(r"[a-z]{4,}", word)
+                   and wordfreq.zipf_frequency(word, "en") >= min_zipf)
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(f"# English words, 4+ letters, Zipf frequency >= {min_zipf}\n"
+                   f"# Generated by `python kb_index.py --export-words` from wordfreq "
+                   f"{version('wordfreq')} (https://github.com/rspeer/wordfreq, "
+                   f"data CC BY-SA 4.0)\n")
+        file.writelines(f"{word}\n" for word in words)
+    return len(words)
+
+# --- KNOWLEDGE BASE → PAIRS ---
+def load_kb(path=KB_FILE):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def _escape(word):
+    """Plain words stay plain (so the automaton takes them); anything else is escaped."""
+    word = word.lower()
+    return word if is_literal(word) else re.escape(word)
+
+def build_pairs(kb, variant="pro"):
+    """nltk-style (pattern, responses) pairs + protocol ids, in knowledge-base order."""
+    pairs, labels = [], []
+    for protocol in kb["protocols"]:
+        alternatives = [f".*{_escape(word)}.*" for word in protocol.get("keywords", [])]
+        alternatives += [_escape(word) for word in protocol.get("prefixes", [])]
+        alternatives += protocol.get("patterns", [])   # Raw regexes, kept as-is
+        if protocol.get("fallback"):
+            alternatives.append("(.*)")
+        responses = protocol["responses"]
+        pairs.append(("|".join(alternatives),
+                      responses.get(variant) or next(iter(responses.values()))))
+        labels.append(protocol["id"])
+    return pairs, labels
+
+# --- EDIT DISTANCE ---
+def within_distance(a, b, limit):
+    """Optimal-string-alignment distance(a, b) <= limit (a swap counts as one typo)."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    before, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1,
+                        previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:   # Whole row over budget → can only get worse
+            return False
+        before, previous = previous, current
+    return previous[-1] <= limit
+
+def deletions(word, depth):
+    """`word` with every combination of up to `depth` letters removed."""
+    found = frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        found = found | frontier
+    return found
+
+# --- INDEX ---
+class KnowledgeIndex(IntentEngine):
+    """IntentEngine over the knowledge base + inverted indexes for typo lookup."""
+
+    def __init__(self, kb, variant="pro"):
+        pairs, labels = build_pairs(kb, variant)
+        super().__init__(pairs, REFLECTIONS, labels)
+        self.variant = variant
+        self.phrases = []   # (protocol index, keyword words)
+        self.postings = {}  # keyword word → phrase ids containing it
+        self._deletes = None      # Built on first typo lookup (see typo_indexes)
+        self._vocabulary = None
+
+        for index, protocol in enumerate(kb["protocols"]):
+            for keyword in protocol.get("keywords", []):
+                words = tuple(TOKEN_RE.findall(keyword.lower()))
+                if words:
+                    for word in set(words):
+                        self.postings.setdefault(word, []).append(len(self.phrases))
+                    self.phrases.append((index, words))
+
+    def to_state(self):
+        return {**super().to_state(), "variant": self.variant, "phrases": self.phrases,
+                "postings": self.postings}
+
+    @classmethod
+    def from_state(cls, state):
+        index = super().from_state(state)
+        index.variant, index.phrases = state["variant"], state["phrases"]
+        index.postings = state["postings"]
+        index._deletes = index._vocabulary = None
+        return index
+
+    def typo_indexes(self):
+        """
+        (deletes, vocabulary): keyword word minus one letter → keyword words, and the
+        real words never treated as typos. Only messages headed for the fallback need them.
+        """
+        if self._deletes is None:
+            vocabulary = load_words()
+            for _, responses in self.pairs:
+                for response in responses:
+                    vocabulary.update(TOKEN_RE.findall(response.lower()))
+            deletes = {}
+            for word in self.postings:
+                for variant in deletions(word, max_edits(word)) if max_edits(word) else ():
+                    deletes.setdefault(variant, []).append(word)
+            self._vocabulary, self._deletes = vocabulary, deletes
+        return self._deletes, self._vocabulary
+
+    def match(self, text):
+        """Exact match first; the typo lookup only rescues messages headed for the fallback."""
+        index = super().match(text)
+        if index is None or index == self.fallback:
+            fuzzy = self.fuzzy_match(text)
+            if fuzzy is not None and (index is None or fuzzy < index):
+                return fuzzy
+        return index
+
+    def similar_words(self, token):
+        """Keyword words equal to `token` or within their typo budget of it."""
+        found = {token} if token in self.postings else set()
+        if found or len(token) < 4:
+            return found   # Exact keyword, or too short to be a typo
+        deletes, vocabulary = self.typo_indexes()
+        if token in vocabulary:
+            return found   # A real word, not a typo
+        # Within k typos ⇔ both sides share a form with at most k letters dropped
+        for variant in deletions(token, MAX_TYPOS):
+            for word in deletes.get(variant, ()):
+                if word not in found and within_distance(token, word, max_edits(word)):
+                    found.add(word)
+        return found
+
+    def fuzzy_match(self, text):
+        """Lowest protocol index whose keyword phrase appears in `text` with typos."""
+        tokens = TOKEN_RE.findall(text.split("\n", 1)[0].lower())
+        options = [self.similar_words(token) for token in tokens]
+        best = None
+        for position, words in enumerate(options):
+            for word in words:
+                for phrase_id in self.postings[word]:
+                    index, phrase = self.phrases[phrase_id]
+                    if best is not None and index >= best:
+                        continue
+                    for offset, phrase_word in enumerate(phrase):
+                        start = position - offset
+                        if phrase_word == word and start >= 0 \
+                                and start + len(phrase) <= len(options) \
+                                and all(w in options[start + k] for k, w in enumerate(phrase)):
+                            best = index
+                            break
+        return best
+
+# --- CACHE ---
+def _digest(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def load_index(path=KB_FILE, variant="pro"):
+    """
+    Compiled index for `path`, from the cache when the data file is unchanged.
+    Cache layout: marshal (header dict (version, python, sha256), KnowledgeIndex.to_state())
+    - plain data only, so loading it runs no code.
+    """
+    cache = os.path.join(os.path.dirname(os.path.abspath(path)), f".kb_index.{variant}.cache")
+    header = {"version": CACHE_VERSION, "python": list(sys.version_info[:2]),
+              "sha256": _digest(path)}
+    collecting = gc.isenabled()
+    gc.disable()   # Loading creates ~20 objects per protocol; GC passes would double the time
+    try:
+        with open(cache, "rb") as file:
+            cached_header, state = marshal.loads(file.read())   # load(file) reads byte-wise
+        if cached_header == header and isinstance(state, dict):
+            return KnowledgeIndex.from_state(state)
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass   # Missing, stale or damaged cache → rebuild
+    finally:
+        if collecting:
+            gc.enable()
+
+    index = KnowledgeIndex(load_kb(path), variant)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache), suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(marshal.dumps((header, index.to_state())))
+        os.replace(tmp_path, cache)
+    except OSError:
+        pass   # Read-only install: just run without a cache
+    return index
+
+# --- BENCHMARK ---
+def synthetic_kb(count, seed=0):
+    """`count` protocols with 3 synonyms each, plus greeting and fallback."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    protocols = [{"id": f"p{i}", "responses": {"pro": [f"protocol {i}"]},
+                  "keywords": ["".join(rng.choice(letters) for _ in range(rng.randint(5, 10)))
+                               for _ in range(3)]} for i in range(count)]
+    protocols.append({"id": "greeting", "prefixes": ["hi", "hello"], "responses": {"pro": ["hi"]}})
+    protocols.append({"id": "fallback", "fallback": True, "responses": {"pro": ["?"]}})
+    return {"version": 1, "protocols": protocols}
+
+def benchmark(sizes=(10, 300, 3000), messages=2000):
+    rng = random.Random(1)
+    print(f"{'protocols':>10} {'build ms':>9} {'cached ms':>10} {'exact us':>9} {'typo us':>8} "
+          f"{'miss us':>8}")
+    for size in sizes:
+        kb = synthetic_kb(size)
+        started = time.perf_counter()
+        index = KnowledgeIndex(kb)
+        build_ms = (time.perf_counter() - started) * 1000
+        data = marshal.dumps(index.to_state())
+        gc.disable()
+        started = time.perf_counter()
+        index = KnowledgeIndex.from_state(marshal.loads(data))   # What load_index() does
+        cached_ms = (time.perf_counter() - started) * 1000
+        gc.enable()
+        index.typo_indexes()   # Built on the first typo lookup - keep it out of the timings
+
+        keywords = [kw for p in kb["protocols"][:size] for kw in p["keywords"]]
+        exact = [f"my friend has {rng.choice(keywords)} right now" for _ in range(messages)]
+        typo = []
+        for _ in range(messages):
+            word = list(rng.choice(keywords))
+            i = rng.randrange(len(word) - 1)
+            word[i], word[i + 1] = word[i + 1], word[i]   # Swap two letters
+            typo.append(f"my friend has {''.join(word)} right now")
+        miss = ["my friend fell down the stairs and hurt his arm badly"] * messages
+
+        timings = []
+        for texts in (exact, typo, miss):
+            started = time.perf_counter()
+            for text in texts:
+                index.match(text)
+            timings.append((time.perf_counter() - started) / messages * 1e6)
+        print(f"{size:>10} {build_ms:>9.1f} {cached_ms:>10.1f} {timings[0]:>9.1f} "
+              f"{timings[1]:>8.1f} {timings[2]:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Medi-Plus knowledge base index")
+    parser.add_argument("message", nargs="?", help="message to look up")
+    parser.add_argument("--kb", default=KB_FILE, help="knowledge base JSON file")
+    parser.add_argument("--variant", default="pro", choices=["pro", "classic"])
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="time lookups with a synthetic KB of up to N protocols")
+    parser.add_argument("--export-words", action="store_true",
+                        help=f"rebuild {os.path.basename(WORDS_FILE)} (needs wordfreq)")
+    args = parser.parse_args()
+
+    if args.export_words:
+        print(f"{export_words():,} words written to {WORDS_FILE}")
+        return
+
+    if args.bench:
+        benchmark(sorted({10, max(10, args.bench // 10), args.bench}))
+        return
+    started = time.perf_counter()
+    index = load_index(args.kb, args.variant)
+    print(f"Index ready in {(time.perf_counter() - started) * 1000:.1f} ms "
+          f"({len(index.pairs)} protocols, {len(index.postings)} keyword words)")
+    if args.message:
+        exact = IntentEngine.match(index, args.message.lower())
+        found = index.match(args.message.lower())
+        how = "typo match" if found != exact else "exact match"
+        print(f"{index.label(found)} ({how})")
+
+if __name__ == "__main__":
+    main()
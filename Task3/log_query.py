@@ -0,0 +1,354 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Indexed queries over the session logs)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Answers questions about session_log.jsonl (written by
+conversation_logger.py, including the daily/size-rotated
+session_log.<stamp>.jsonl segments) or the older session_log.txt
+("[ts] USER: ..." / "[ts] BOT: ..." records separated by a dashed line)
+without re-parsing the whole history every time:
+
+  - the log is memory-mapped and scanned with one compiled regex
+    (nothing is loaded into Python lines)
+  - a sidecar index (<log>.idx/) stores, per intent, two append-only
+    binary columns: timestamps (sorted) and the byte offset of the user
+    message; a small meta.json records how far the log has been indexed
+  - each run only parses what was appended since the last run; a
+    truncated or replaced log is re-indexed from scratch, and rotated
+    segments (which never change again) are indexed once
+  - count / top intents = two binary searches per intent, so answers take
+    milliseconds regardless of log size
+
+The intent of a text-log record is recognized from the first line of the
+bot's reply (knowledge_base.json, both wordings); JSONL records carry it.
+
+USAGE:  python log_query.py count --intent cardiac --day yesterday
+        python log_query.py top --since "2026-01-30 08:00" --until "2026-01-30 18:00"
+        python log_query.py inputs --intent fallback -n 20
+        python log_query.py --log session_log.txt top
+"""
+
+import argparse
+import calendar
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from kb_index import load_kb
+
+# --- CONFIGURATION ---
+LOG_FILE = "session_log.jsonl"
+INDEX_VERSION = 2
+HEAD_BYTES = 4096            # Indexed prefix hashed to notice a replaced/rotated file
+SEPARATOR = b"-" * 50 + b"\n"
+UNKNOWN_INTENT = "unknown"
+SAFE_NAME = re.compile(r"[^\w-]")   # Intent ids → column file names
+
+# One record of the text log: timestamp, user message, first line of the bot reply
+TEXT_RECORD = re.compile(rb"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] USER: ?(.*)\n"
+                         rb"\[[^\]\n]*\] BOT: *(.*)$", re.M)
+# One record written by conversation_logger.py (fixed key order)
+JSONL_RECORD = re.compile(rb'^\{"ts": "(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)[^"]*", '
+                          rb'"session": (?:"[^"]*"|null), "intent": (?:"([^"]*)"|null), '
+                          rb'"user": "', re.M)
+
+# --- PARSING ---
+_day_cache = {}
+
+def to_epoch(stamp):
+    """b"2026-01-30 13:22:17" → seconds (log times are naive local times, kept as-is)."""
+    day = stamp[:10]
+    base = _day_cache.get(day)
+    if base is None:
+        base = _day_cache[day] = calendar.timegm(
+            (int(day[:4]), int(day[5:7]), int(day[8:10]), 0, 0, 0))
+    return base + int(stamp[11:13]) * 3600 + int(stamp[14:16]) * 60 + int(stamp[17:19])
+
+def reply_intents():
+    """First line of every known bot reply → protocol id."""
+    intents = {}
+    for protocol in load_kb()["protocols"]:
+        for responses in protocol["responses"].values():
+            for response in responses:
+                intents[response.split("\n", 1)[0].strip().encode()] = protocol["id"]
+    return intents
+
+def scan_records(mm, start, end, jsonl, intents=None):
+    """Yields (epoch seconds, intent, offset of the user message) for [start, end)."""
+    if jsonl:
+        for match in JSONL_RECORD.finditer(mm, start, end):
+            intent = (match.group(2) or b"").decode() or UNKNOWN_INTENT
+            yield to_epoch(match.group(1)), intent, match.end()
+    else:
+        for match in TEXT_RECORD.finditer(mm, start, end):
+            intent = intents.get(match.group(3).strip(), UNKNOWN_INTENT)
+            yield to_epoch(match.group(1)), intent, match.start(2)
+
+# --- SIDECAR INDEX ---
+class LogIndex:
+    """Index of one log file. `sealed`: a rotated segment, never appended to again."""
+
+    def __init__(self, log_path=LOG_FILE, index_dir=None, sealed=False):
+        self.log_path = log_path
+        self.index_dir = index_dir or f"{log_path}.idx"
+        self.jsonl = log_path.endswith(".jsonl")
+        self.sealed = sealed
+        self.meta = None
+        self.columns = {}    # (intent, "ts" | "off") → array
+
+    # --- BUILDING ---
+    def _head_digest(self, mm, indexed_bytes):
+        """Hash of the already-indexed start of the file (append-only: it never changes)."""
+        return hashlib.sha1(mm[:min(indexed_bytes, HEAD_BYTES)]).hexdigest()
+
+    def _column_path(self, intent, kind):
+        return os.path.join(self.index_dir, f"{SAFE_NAME.sub('_', intent)}.{kind}")
+
+    def _load_meta(self):
+        try:
+            with open(os.path.join(self.index_dir, "meta.json"), encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta.get("version") == INDEX_VERSION:
+                return meta
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_meta(self, meta):
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2)
+        os.replace(tmp_path, os.path.join(self.index_dir, "meta.json"))
+
+    def _reset(self):
+        """Empties the index (columns and meta.json) and returns the fresh meta."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        for name in os.listdir(self.index_dir):
+            if name.endswith((".ts", ".off")) or name == "meta.json":
+                os.remove(os.path.join(self.index_dir, name))
+        return {"version": INDEX_VERSION, "indexed_bytes": 0, "head": None, "inode": None,
+                "counts": {}}
+
+    def update(self, rebuild=False):
+        """Indexes whatever was appended since the last run (everything if `rebuild`)."""
+        self.columns.clear()
+        meta = self._reset() if rebuild else self._load_meta()
+        stat = os.stat(self.log_path)
+        inode = [stat.st_dev, stat.st_ino]
+        if (self.sealed and meta and meta["inode"] == inode
+                and meta["indexed_bytes"] == stat.st_size):
+            self.meta = meta   # Rotated segment, already fully indexed
+            return 0
+        if stat.st_size == 0:
+            self.meta = meta or self._reset()
+            return 0
+
+        with open(self.log_path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if meta is None or meta["inode"] != inode or meta["indexed_bytes"] > len(mm) \
+                    or meta["head"] != self._head_digest(mm, meta["indexed_bytes"]):
+                meta = self._reset()   # New, truncated, rotated away or replaced log
+            self._truncate_columns(meta)
+
+            # Only complete records: stop after the last separator / newline
+            start = meta["indexed_bytes"]
+            end = mm.rfind(b"\n" if self.jsonl else SEPARATOR, start)
+            if end < 0:
+                meta["inode"], meta["head"] = inode, self._head_digest(mm, start)
+                self.meta = meta
+                return 0
+            end += 1 if self.jsonl else len(SEPARATOR)
+
+            batches = {}
+            intents = None if self.jsonl else reply_intents()
+            for ts, intent, offset in scan_records(mm, start, end, self.jsonl, intents):
+                ts_col, off_col = batches.setdefault(intent, (array("q"), array("Q")))
+                ts_col.append(ts)
+                off_col.append(offset)
+
+            added = 0
+            for intent, (ts_col, off_col) in batches.items():
+                with open(self._column_path(intent, "ts"), "ab") as file:
+                    ts_col.tofile(file)
+                with open(self._column_path(intent, "off"), "ab") as file:
+                    off_col.tofile(file)
+                meta["counts"][intent] = meta["counts"].get(intent, 0) + len(ts_col)
+                added += len(ts_col)
+
+            meta["indexed_bytes"], meta["inode"] = end, inode
+            meta["head"] = self._head_digest(mm, end)
+            self._save_meta(meta)   # Columns first, meta last: a crash leaves extra rows only
+        self.meta = meta
+        return added
+
+    def _truncate_columns(self, meta):
+        """Drops rows written by a run that crashed before saving meta.json."""
+        for intent, count in meta["counts"].items():
+            for kind, itemsize in (("ts", 8), ("off", 8)):
+                path = self._column_path(intent, kind)
+                if os.path.exists(path) and os.path.getsize(path) > count * itemsize:
+                    os.truncate(path, count * itemsize)
+
+    # --- QUERIES ---
+    def intents(self):
+        return sorted(self.meta["counts"])
+
+    def column(self, intent, kind):
+        key = (intent, kind)
+        if key not in self.columns:
+            values = array("q" if kind == "ts" else "Q")
+            path = self._column_path(intent, kind)
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    values.fromfile(file, self.meta["counts"].get(intent, 0))
+            self.columns[key] = values
+        return self.columns[key]
+
+    def _window(self, intent, since=None, until=None):
+        timestamps = self.column(intent, "ts")
+        low = 0 if since is None else bisect_left(timestamps, since)
+        high = len(timestamps) if until is None else bisect_left(timestamps, until)
+        return low, max(low, high)
+
+    def count(self, intent=None, since=None, until=None):
+        """Records in [since, until) - one intent or all of them."""
+        intents = [intent] if intent else self.intents()
+        return sum(high - low for low, high in (self._window(i, since, until) for i in intents))
+
+    def top_intents(self, n=10, since=None, until=None):
+        counts = Counter({intent: self.count(intent, since, until) for intent in self.intents()})
+        return [(intent, count) for intent, count in counts.most_common(n) if count]
+
+    def input_counts(self, intent, since=None, until=None):
+        """Counter of user messages for one intent (reads only those records)."""
+        low, high = self._window(intent, since, until)
+        counts = Counter()
+        if high > low:
+            offsets = self.column(intent, "off")[low:high]
+            with open(self.log_path, "rb") as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in offsets:
+                    counts[self._user_text(mm, offset).strip().lower()] += 1
+        return counts
+
+    def top_inputs(self, intent, n=10, since=None, until=None):
+        """Most frequent user messages for one intent."""
+        return self.input_counts(intent, since, until).most_common(n)
+
+    def _user_text(self, mm, offset):
+        if self.jsonl:   # Offset points just after `"user": "` - read the JSON string
+            raw = mm[offset:mm.find(b"\n", offset)]
+            return json.JSONDecoder().raw_decode('"' + raw.decode("utf-8", "replace"))[0]
+        return mm[offset:mm.find(b"\n", offset)].decode("utf-8", "replace")
+
+# --- LIVE LOG + ROTATED SEGMENTS ---
+def log_segments(log_path):
+    """Rotated session_log.<stamp>.jsonl files (oldest first), then the live log."""
+    stem, ext = os.path.splitext(log_path)
+    rotated = sorted(glob.glob(f"{glob.escape(stem)}.*{ext}")) if ext == ".jsonl" else []
+    return rotated + ([log_path] if os.path.exists(log_path) else [])
+
+class LogSet:
+    """Queries over a log and its rotated segments (one LogIndex per file)."""
+
+    def __init__(self, log_path=LOG_FILE):
+        self.log_path = log_path
+        self.indexes = []
+
+    def update(self, rebuild=False):
+        segments = log_segments(self.log_path)
+        if not segments:
+            raise FileNotFoundError(self.log_path)
+        stem, ext = os.path.splitext(self.log_path)
+        for index_dir in glob.glob(f"{glob.escape(stem)}.*{ext}.idx"):
+            if index_dir[:-len(".idx")] not in segments:   # Segment deleted by rotation
+                shutil.rmtree(index_dir, ignore_errors=True)
+        self.indexes = [LogIndex(path, sealed=path != self.log_path) for path in segments]
+        return sum(index.update(rebuild) for index in self.indexes)
+
+    def intents(self):
+        return sorted({intent for index in self.indexes for intent in index.intents()})
+
+    def count(self, intent=None, since=None, until=None):
+        return sum(index.count(intent, since, until) for index in self.indexes)
+
+    def top_intents(self, n=10, since=None, until=None):
+        counts = Counter({intent: self.count(intent, since, until) for intent in self.intents()})
+        return [(intent, count) for intent, count in counts.most_common(n) if count]
+
+    def top_inputs(self, intent, n=10, since=None, until=None):
+        counts = Counter()
+        for index in self.indexes:
+            counts.update(index.input_counts(intent, since, until))
+        return counts.most_common(n)
+
+# --- CLI ---
+def parse_time(text):
+    """'2026-01-30', '2026-01-30 13:00' or '2026-01-30 13:00:05' → epoch seconds."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return calendar.timegm(datetime.strptime(text, fmt).timetuple())
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"bad time {text!r} (use YYYY-MM-DD [HH:MM[:SS]])")
+
+def day_window(text):
+    """'today', 'yesterday' or a date → (start, end) epoch seconds of that day."""
+    if text in ("today", "yesterday"):
+        day = date.today() - timedelta(days=text == "yesterday")
+        text = day.isoformat()
+    start = parse_time(text)
+    return start, start + 86400
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the Medi-Plus session logs")
+    parser.add_argument("--log", default=LOG_FILE, help=f"log file (default {LOG_FILE})")
+    parser.add_argument("--rebuild", action="store_true", help="re-index from scratch")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("count", "number of records"), ("top", "most frequent intents"),
+                            ("inputs", "most frequent user messages for an intent")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--intent", required=name == "inputs",
+                             help="protocol id, e.g. cardiac, fallback")
+        command.add_argument("--since", type=parse_time, help="YYYY-MM-DD [HH:MM[:SS]]")
+        command.add_argument("--until", type=parse_time, help="YYYY-MM-DD [HH:MM[:SS]]")
+        command.add_argument("--day", help="today, yesterday or YYYY-MM-DD")
+        command.add_argument("-n", type=int, default=10, help="rows for top/inputs")
+    args = parser.parse_args()
+
+    since, until = day_window(args.day) if args.day else (args.since, args.until)
+    index = LogSet(args.log)
+    try:
+        started = time.perf_counter()
+        added = index.update(rebuild=args.rebuild)
+        indexed_ms = (time.perf_counter() - started) * 1000
+    except FileNotFoundError:
+        print(f"Error: Could not find {args.log}.")
+        return
+
+    started = time.perf_counter()
+    if args.command == "count":
+        print(index.count(args.intent, since, until))
+    elif args.command == "top":
+        for intent, count in index.top_intents(args.n, since, until):
+            print(f"{count:>10,}  {intent}")
+    else:
+        for message, count in index.top_inputs(args.intent, args.n, since, until):
+            print(f"{count:>10,}  {message}")
+    query_ms = (time.perf_counter() - started) * 1000
+    print(f"({added:,} new records indexed in {indexed_ms:.1f} ms, query {query_ms:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,14 @@ VERSION: 3.0 (Professional Edition)
 -----------------------------------------------------------------------
 """
 
-import nltk
-from nltk.chat.util import Chat, reflections
 import time
+STARTED = time.perf_counter()   # For the startup time report
+
 import sys
 import os
-from datetime import datetime
+from intent_engine import converse
+from kb_index import load_index
+from conversation_logger import get_logger
 
 # --- COLOR CODES FOR PROFESSIONAL UI ---
 class Colors:
@@ -27,13 +29,9 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 # --- LOGGING SYSTEM (The Professional Touch) ---
-def log_conversation(user_input, bot_response):
-    """Saves the chat to a file for medical records."""
-    with open("session_log.txt", "a", encoding="utf-8") as file:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        file.write(f"[{timestamp}] USER: {user_input}\n")
-        file.write(f"[{timestamp}] BOT:  {bot_response}\n")
-        file.write("-" * 50 + "\n")
+def log_conversation(user_input, bot_response, session=None, intent=None, latency_ms=None):
+    """Queues the turn for the background medical-records writer (session_log.jsonl)."""
+    get_logger().log(user_input, bot_response, session, intent, latency_ms)
 
 # --- TYPING EFFECT ---
 def type_text(text, speed=0.02, color=Colors.CYAN):
@@ -45,9 +43,12 @@ def type_text(text, speed=0.02, color=Colors.CYAN):
         time.sleep(speed)
     sys.stdout.write(Colors.ENDC + "\n") # Reset color
 
-def print_banner():
-    # Clear screen for a fresh start
-    os.system('cls' if os.name == 'nt' else 'clear')
+def print_banner(fast=False):
+    # Clear screen for a fresh start (fast mode: ANSI escape instead of a subprocess)
+    if fast:
+        sys.stdout.write("\033[2J\033[H")
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
     
     logo = f"""{Colors.BOLD}{Colors.BLUE}
     ███╗   ███╗███████╗██████╗ ██╗      ██████╗ ██╗     ██╗   ██╗███████╗
@@ -62,100 +63,70 @@ def print_banner():
     print(f"{Colors.WARNING} [DISCLAIMER]: I am an AI. For life-threatening emergencies, call 911/112 immediately.{Colors.ENDC}")
     print("-" * 80)
 
-# --- KNOWLEDGE BASE (Regex Patterns) ---
-pairs = [
-    # 1. CPR / Unconscious
-    (r".*unconscious.*|.*not breathing.*|.*cpr.*",
-     ["🚨 [CRITICAL RESPONSE REQUIRED]\n"
-      "1. Call Ambulance IMMEDIATELY.\n"
-      "2. Check for pulse/breathing.\n"
-      "3. If NO pulse: Begin CPR.\n"
-      "   -> Push HARD & FAST on center of chest (100-120 bpm).\n"
-      "   -> Continue until help arrives."]),
-
-    # 2. Choking
-    (r".*choking.*|.*cant breathe.*",
-     ["⚠️  [AIRWAY OBSTRUCTION DETECTED]\n"
-      "ACTION: Perform Heimlich Maneuver:\n"
-      "1. Stand behind the person.\n"
-      "2. Wrap arms around waist.\n"
-      "3. Make a fist above the navel.\n"
-      "4. Thrust UPWARD hard until object is expelled."]),
-
-    # 3. Severe Bleeding
-    (r".*bleeding.*|.*cut.*|.*blood.*",
-     ["🩸 [HEMORRHAGE CONTROL PROTOCOL]\n"
-      "1. Apply DIRECT PRESSURE with a clean cloth.\n"
-      "2. Elevate the injury above heart level.\n"
-      "3. Do NOT remove soaked cloths; add more layers on top.\n"
-      "4. If arterial (spurting) blood: Consider a tourniquet."]),
-
-    # 4. Burns
-    (r".*burn.*",
-     ["🔥 [BURN TREATMENT PROTOCOL]\n"
-      "1. Hold area under COOL running water (10-15 mins).\n"
-      "2. Remove jewelry/tight items immediately.\n"
-      "3. Do NOT pop blisters.\n"
-      "4. Cover loosely with sterile gauze or cling wrap."]),
-
-    # 5. Heart Attack
-    (r".*chest pain.*|.*heart attack.*",
-     ["💔 [CARDIAC ALERT]\n"
-      "1. Call Emergency Services NOW.\n"
-      "2. Have patient SIT DOWN and stay calm.\n"
-      "3. Loosen tight clothing.\n"
-      "4. If not allergic, chew 300mg Aspirin."]),
-
-    # 6. Panic Attacks
-    (r".*panic.*|.*anxiety.*|.*scared.*",
-     ["🧘 [CALM DOWN SEQUENCE ACTIVATED]\n"
-      "You are safe. Focus on my instructions:\n"
-      "1. Inhale deeply ... (4 seconds)\n"
-      "2. Hold breath ... (7 seconds)\n"
-      "3. Exhale slowly ... (8 seconds)\n"
-      "Repeat this cycle 3 times."]),
-
-    # 7. Greetings
-    (r"hi|hello|hey|help",
-     ["Hello. I am Medi-Plus Pro. I am listening.\n"
-      "Please state the emergency (e.g., 'Severe Burn', 'Choking', 'Chest Pain')."]),
-
-    # 8. Fallback
-    (r"(.*)",
-     ["❌ I did not understand that medical term.\n"
-      "Please describe the symptom simply (e.g., 'Cut', 'Burn', 'Faint').\n"
-      "If this is an emergency, call an Ambulance."])
-]
+# --- KNOWLEDGE BASE (knowledge_base.json, "pro" wording) ---
+# Compiled into one keyword automaton + typo index by kb_index.py; the compiled
+# index is cached (plain marshal data) and only rebuilt when the JSON file changes.
+ENGINE = load_index(variant="pro")
+pairs = ENGINE.pairs
+
+# --- RESPONSE PATH (no sleeps, no printing - shared with triage_server.py) ---
+def normalize(user_input):
+    """Enforce Case Insensitivity (and drop trailing "!"/"." like nltk's converse loop)."""
+    return user_input.lower().rstrip("!.")
+
+def classify(user_input):
+    """Intent label only - same matching as triage_reply (used by batch_classify.py)."""
+    return ENGINE.label(ENGINE.match(normalize(user_input)))
+
+def triage_reply(user_input, log=True, session=None):
+    """Matches one message; returns (intent label, response)."""
+    started = time.perf_counter()
+    user_input = normalize(user_input)
+
+    index, result = ENGINE.answer(user_input)
+    intent = ENGINE.label(index)
+    if result and log:
+        # Log the interaction (queued - the file is written by a background thread)
+        log_conversation(user_input, result, session, intent,
+                         (time.perf_counter() - started) * 1000)
+    return intent, result
 
 # --- SMART CHAT ENGINE ---
-class MedicalChat(Chat):
+class MedicalChat:
+    def __init__(self, fast=False):
+        self.fast = fast
+
     def respond(self, str):
-        # Enforce Case Insensitivity
-        str = str.lower()
-        
-        result = super().respond(str)
+        _, result = triage_reply(str)
         if result:
+            if self.fast:
+                print(f"{Colors.GREEN}{result}{Colors.ENDC}")
+                return None
+
             # Simulate processing time
             time.sleep(0.5)
             
             # Print response in Green for visibility
             type_text(result, speed=0.01, color=Colors.GREEN)
-            
-            # Log the interaction
-            log_conversation(str, result)
             return None
         return None
 
-def start_system():
-    print_banner()
-    type_text("INITIALIZING NEURAL NETWORK...", 0.04, Colors.CYAN)
-    time.sleep(1)
-    type_text("ACCESSING MEDICAL DATABASE...", 0.04, Colors.CYAN)
-    time.sleep(0.5)
-    print(f"{Colors.GREEN}✔ SYSTEM READY.{Colors.ENDC}\n")
+    def converse(self, quit="quit"):
+        converse(self.respond, quit)
+
+def start_system(fast=False):
+    print_banner(fast)
+    if not fast:
+        type_text("INITIALIZING NEURAL NETWORK...", 0.04, Colors.CYAN)
+        time.sleep(1)
+        type_text("ACCESSING MEDICAL DATABASE...", 0.04, Colors.CYAN)
+        time.sleep(0.5)
+    ready_ms = (time.perf_counter() - STARTED) * 1000
+    print(f"{Colors.GREEN}✔ SYSTEM READY.{Colors.ENDC} ({ready_ms:.0f} ms)\n")
     
-    chat = MedicalChat(pairs, reflections)
+    chat = MedicalChat(fast)
     chat.converse()
 
 if __name__ == "__main__":
-    start_system()
\ No newline at end of file
+    # --fast (or MEDIPLUS_FAST=1): no screen-clear subprocess, boot animation or typing delays
+    start_system(fast="--fast" in sys.argv[1:] or os.environ.get("MEDIPLUS_FAST") == "1")
\ No newline at end of file
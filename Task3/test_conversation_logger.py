@@ -0,0 +1,48 @@
+"""Tests for the background conversation logger (run: python -m pytest Task3)."""
+
+import glob
+import os
+import queue
+import tempfile
+import time
+import unittest
+
+from conversation_logger import ConversationLogger
+
+
+class ConversationLoggerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session_log.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_single_record_batches_rotate_by_size(self):
+        logger = ConversationLogger(self.path, max_bytes=500, backups=100, daily=False,
+                                    flush_interval=0.01)
+        for turn in range(20):   # One record per batch, like the interactive bot
+            logger.log(f"message {turn}", "reply " * 20, intent="fallback")
+            while logger.written <= turn:
+                time.sleep(0.005)
+        logger.close()
+
+        files = glob.glob(os.path.join(self.tmp.name, "session_log*.jsonl"))
+        self.assertGreater(len(files), 1)
+        self.assertTrue(all(os.path.getsize(f) <= 500 for f in files))
+        lines = sum(len(open(f, encoding="utf-8").readlines()) for f in files)
+        self.assertEqual(lines, 20)
+
+    def test_close_returns_when_writer_is_gone(self):
+        logger = ConversationLogger(self.path, queue_size=1)
+        logger.close()
+        logger.closed = False   # Writer thread has exited; fill the queue behind its back
+        logger.queue.put_nowait(("stale",))
+        self.assertRaises(queue.Full, logger.queue.put_nowait, ("stale",))
+        started = time.monotonic()
+        logger.close(timeout=0.2)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
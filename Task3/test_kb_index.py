@@ -0,0 +1,33 @@
+"""Regression tests for the knowledge base index (run: python -m pytest Task3)."""
+
+import unittest
+
+from kb_index import load_index
+
+
+class TypoToleranceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.index = load_index(variant="pro")
+
+    def classify(self, message):
+        return self.index.label(self.index.match(message.lower()))
+
+    def test_typos_still_reach_their_protocol(self):
+        for message, intent in (("my son is bleding", "bleeding"), ("he is chokng", "choking"),
+                                ("so much anxeity", "panic"),
+                                ("he is unconcious", "cpr")):
+            with self.subTest(message=message):
+                self.assertEqual(self.classify(message), intent)
+
+    def test_everyday_sentences_fall_back(self):
+        for message in ("i was cooking dinner", "my baby is sleeping", "we are feeding the dog",
+                        "the basement has a flood", "i am speeding", "i feel manic",
+                        "the blender is blending soup", "the fish was scaled",
+                        "he scarfed his lunch"):
+            with self.subTest(message=message):
+                self.assertEqual(self.classify(message), "fallback")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for the session log index (run: python -m pytest Task3)."""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from log_query import LogIndex, LogSet, day_window
+
+SEPARATOR = "-" * 50
+
+def text_record(stamp, user, bot):
+    return f"[{stamp}] USER: {user}\n[{stamp}] BOT:  {bot}\n{SEPARATOR}\n"
+
+def jsonl_record(stamp, intent, user):
+    """Same key order as conversation_logger.py."""
+    return json.dumps({"ts": stamp.isoformat(timespec="milliseconds"), "session": "s1",
+                       "intent": intent, "user": user, "bot": "...", "latency_ms": 0.01}) + "\n"
+
+
+class LogIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session_log.txt")
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(text_record("2026-01-30 13:22:17", "having heart attack",
+                                   "💔 [CARDIAC ALERT]\n1. Call Emergency Services NOW."))
+            file.write(text_record("2026-01-30 13:23:21", "no emergency",
+                                   "❌ I did not understand that medical term."))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_count_rebuild_count(self):
+        index = LogIndex(self.path)
+        self.assertEqual(index.update(), 2)
+        self.assertEqual(index.count(), 2)
+
+        rebuilt = LogIndex(self.path)
+        self.assertEqual(rebuilt.update(rebuild=True), 2)
+        self.assertEqual(rebuilt.count(), 2)
+        self.assertEqual(rebuilt.count("cardiac"), 1)
+
+        again = LogIndex(self.path)   # A later run sees the rebuilt index
+        self.assertEqual(again.update(), 0)
+        self.assertEqual(again.count(), 2)
+
+    def test_appended_records_are_indexed_once(self):
+        index = LogIndex(self.path)
+        index.update()
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(text_record("2026-01-31 09:00:00", "burning", "🔥 [BURN TREATMENT PROTOCOL]"))
+        self.assertEqual(index.update(), 1)
+        self.assertEqual(index.count("burn"), 1)
+        self.assertEqual(index.top_inputs("fallback"), [("no emergency", 1)])
+
+
+class LogSetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session_log.jsonl")
+        self.yesterday = datetime.now().replace(hour=12) - timedelta(days=1)
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(jsonl_record(self.yesterday, "cardiac", "having heart attack"))
+            file.write(jsonl_record(self.yesterday, "cardiac", "chest pain"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def rotate(self):
+        """What ConversationLogger does at midnight."""
+        rotated = os.path.join(self.tmp.name, "session_log.20260101-000000-000000.jsonl")
+        os.replace(self.path, rotated)
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(jsonl_record(datetime.now(), "burn", "burning"))
+        return rotated
+
+    def test_rotated_segments_are_queried(self):
+        logs = LogSet(self.path)
+        logs.update()
+        rotated = self.rotate()
+
+        logs = LogSet(self.path)
+        self.assertEqual(logs.update(), 3)   # Segment under its new name + new live log
+        self.assertEqual(logs.count("cardiac", *day_window("yesterday")), 2)
+        self.assertEqual(logs.count(), 3)
+        self.assertEqual(logs.top_intents(), [("cardiac", 2), ("burn", 1)])
+        self.assertEqual(logs.top_inputs("cardiac", 1), [("having heart attack", 1)])
+        self.assertEqual(LogSet(self.path).update(), 0)   # Nothing new anywhere
+
+        os.remove(rotated)   # Dropped past BACKUPS
+        logs = LogSet(self.path)
+        logs.update()
+        self.assertEqual(logs.count(), 1)
+        self.assertFalse(os.path.exists(rotated + ".idx"))
+
+
+if __name__ == "__main__":
+    unittest.main()
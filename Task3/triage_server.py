@@ -0,0 +1,291 @@
+"""
+-----------------------------------------------------------------------
+PROJECT: Medi-Plus Pro (AI Medical Assistant)
+TASK: 03 (Multi-session triage server)
+AUTHOR: Aditya Santosh Adhav
+-----------------------------------------------------------------------
+Serves many triage sessions at once from one asyncio process over local
+HTTP (keep-alive, JSON). The server only runs the pure response path
+(medicalbot.triage_reply): no sleeps, no typing effect, no printing.
+The typing effect is a client-side option (`chat --typing`).
+
+  POST /sessions              -> {"session": id}
+  POST /chat  {"session", "message"}
+                              -> {"session", "intent", "reply", "server_ms"}
+                                 (404 for a session that was never opened)
+  GET  /health                -> sessions, requests, server-side p50/p99
+
+USAGE:  python triage_server.py serve --port 8765
+        python triage_server.py chat --url http://127.0.0.1:8765 --typing
+        python triage_server.py bench --sessions 300 --messages 20
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+
+from medicalbot import Colors, triage_reply, type_text
+
+# --- CONFIGURATION ---
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BODY = 16 * 1024          # Bytes per request body
+MAX_SESSIONS = 10_000
+SESSION_IDLE_TIMEOUT = 30 * 60   # Seconds before an idle session is dropped
+LATENCY_WINDOW = 10_000       # Recent server-side timings kept for /health
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+
+# --- SESSIONS ---
+class SessionStore:
+    """In-memory triage sessions (id → turn count + last activity)."""
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT, max_sessions=MAX_SESSIONS):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = {}
+
+    def open(self, session_id=None):
+        if session_id in self.sessions:
+            return session_id
+        if len(self.sessions) >= self.max_sessions:
+            self.expire()
+            if len(self.sessions) >= self.max_sessions:
+                return None
+        session_id = session_id or uuid.uuid4().hex
+        self.sessions[session_id] = {"created": time.time(), "last_seen": time.time(), "turns": 0}
+        return session_id
+
+    def touch(self, session_id):
+        session = self.sessions[session_id]
+        session["last_seen"] = time.time()
+        session["turns"] += 1
+
+    def expire(self):
+        cutoff = time.time() - self.idle_timeout
+        for session_id in [s for s, v in self.sessions.items() if v["last_seen"] < cutoff]:
+            del self.sessions[session_id]
+
+# --- SERVER ---
+class TriageServer:
+    def __init__(self, log=True):
+        self.log = log
+        self.sessions = SessionStore()
+        self.requests = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def route(self, method, path, body):
+        """(status, payload) for one request. Pure CPU work - never awaits."""
+        if path == "/health":
+            ordered = sorted(self.latencies)
+
+            def pick(q):
+                return round(ordered[int(q * (len(ordered) - 1))], 3) if ordered else None
+            return 200, {"status": "ok", "sessions": len(self.sessions.sessions),
+                         "requests": self.requests, "server_ms_p50": pick(0.50),
+                         "server_ms_p99": pick(0.99)}
+        if path not in ("/sessions", "/chat"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "body must be JSON"}
+        if not isinstance(data, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        session_id = data.get("session")
+        if session_id is not None and not isinstance(session_id, str):
+            return 400, {"error": "'session' must be a string"}
+        if path == "/sessions":
+            session_id = self.sessions.open(session_id)
+            if session_id is None:
+                return 503, {"error": "too many sessions"}
+            return 200, {"session": session_id}
+
+        message = data.get("message")
+        if not isinstance(message, str) or not message.strip():
+            return 400, {"error": "'message' must be a non-empty string"}
+        if session_id not in self.sessions.sessions:
+            return 404, {"error": "unknown session (create one with POST /sessions)"}
+
+        started = time.perf_counter()
+        intent, reply = triage_reply(message, self.log, session_id)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.sessions.touch(session_id)
+        self.requests += 1
+        self.latencies.append(elapsed_ms)
+        return 200, {"session": session_id, "intent": intent, "reply": reply,
+                     "server_ms": round(elapsed_ms, 3)}
+
+    async def handle(self, reader, writer):
+        """One client connection; HTTP/1.1 keep-alive until the client closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self.send(writer, 413, {"error": "body too large"}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                close = headers.get("connection", "").lower() == "close"
+                status, payload = self.route(method, path.split("?", 1)[0], body)
+                await self.send(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass   # Client went away or sent garbage - just drop the connection
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, payload, close=False):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(60)
+            self.sessions.expire()
+
+    async def start(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        asyncio.get_running_loop().create_task(self.expire_sessions())
+        return server
+
+async def serve(host=HOST, port=PORT, log=True):
+    server = await TriageServer(log).start(host, port)
+    print(f"{Colors.GREEN}✔ TRIAGE SERVER READY on http://{host}:{port}{Colors.ENDC}")
+    async with server:
+        await server.serve_forever()
+
+# --- CLIENT (presentation lives here, not on the server) ---
+def chat(url, typing=False):
+    import http.client
+    from urllib.parse import urlparse
+
+    target = urlparse(url)
+    connection = http.client.HTTPConnection(target.hostname, target.port or 80)
+
+    def post(path, payload):
+        connection.request("POST", path, json.dumps(payload),
+                           {"Content-Type": "application/json"})
+        return json.loads(connection.getresponse().read())
+
+    session = post("/sessions", {})["session"]
+    print(f"{Colors.GREEN}✔ Connected (session {session[:8]}). Type 'quit' to exit.{Colors.ENDC}")
+    while True:
+        try:
+            message = input(">")
+        except EOFError:
+            break
+        if message.strip().lower() == "quit":
+            break
+        if not message.strip():
+            continue
+        response = post("/chat", {"session": session, "message": message})
+        if "error" in response:   # e.g. the session expired after SESSION_IDLE_TIMEOUT
+            print(f"{Colors.WARNING}{response['error']}{Colors.ENDC}")
+            continue
+        reply = response["reply"]
+        if typing:
+            type_text(reply, speed=0.01, color=Colors.GREEN)
+        else:
+            print(f"{Colors.GREEN}{reply}{Colors.ENDC}")
+
+# --- LOAD TEST ---
+MESSAGES = ["hello", "my friend is not breathing", "there is a lot of blood", "i burned my hand",
+            "he has chest pain", "feeling scared", "what should i do about a rash"]
+
+async def _session_client(host, port, messages, timings):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def post(path, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        return json.loads(await reader.readexactly(length))
+
+    session = (await post("/sessions", {}))["session"]
+    for i in range(messages):
+        started = time.perf_counter()
+        reply = await post("/chat", {"session": session, "message": MESSAGES[i % len(MESSAGES)]})
+        timings.append(((time.perf_counter() - started) * 1000, reply["server_ms"]))
+    writer.close()
+
+async def bench(sessions=300, messages=20):
+    """Runs a server in-process and drives `sessions` concurrent keep-alive clients."""
+    server = await TriageServer(log=False).start(HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    timings = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_session_client(HOST, port, messages, timings)
+                           for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    server.close()
+
+    def pick(values, q):
+        ordered = sorted(values)
+        return ordered[int(q * (len(ordered) - 1))]
+    round_trip = [t for t, _ in timings]
+    server_side = [s for _, s in timings]
+    print(f"{sessions} concurrent sessions x {messages} messages = {len(timings)} replies "
+          f"in {elapsed:.2f} s ({len(timings) / elapsed:,.0f} replies/s)")
+    print(f"server-side  p50 {pick(server_side, 0.5):.3f} ms | p99 {pick(server_side, 0.99):.3f} ms")
+    print(f"round trip   p50 {pick(round_trip, 0.5):.2f} ms | p99 {pick(round_trip, 0.99):.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Medi-Plus Pro multi-session triage server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = commands.add_parser("serve", help="run the HTTP server")
+    serve_cmd.add_argument("--host", default=HOST)
+    serve_cmd.add_argument("--port", type=int, default=PORT)
+    serve_cmd.add_argument("--no-log", action="store_true", help="don't write session_log.jsonl")
+    chat_cmd = commands.add_parser("chat", help="interactive client")
+    chat_cmd.add_argument("--url", default=f"http://{HOST}:{PORT}")
+    chat_cmd.add_argument("--typing", action="store_true", help="typewriter effect (client-side)")
+    bench_cmd = commands.add_parser("bench", help="load test with concurrent sessions")
+    bench_cmd.add_argument("--sessions", type=int, default=300)
+    bench_cmd.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.host, args.port, not args.no_log))
+        elif args.command == "chat":
+            chat(args.url, args.typing)
+        else:
+            asyncio.run(bench(args.sessions, args.messages))
+    except KeyboardInterrupt:
+        print(f"\n{Colors.WARNING}Shutting down.{Colors.ENDC}")
+
+if __name__ == "__main__":
+    main()
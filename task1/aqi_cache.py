@@ -0,0 +1,107 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: On-disk TTL response cache for Open-Meteo AQI values
+Keyed by (lat, lon, parameter, hour bucket) - Open-Meteo's `current`
+value only changes once an hour, so repeat runs inside the same hour
+(cron re-renders every few minutes) never touch the network.
+-----------------------------------------------------------------------
+
+• One small JSON file per entry, written atomically (tmp file + rename)
+• Size-bounded LRU eviction (hits refresh the file's mtime)
+• latest() powers the offline replay mode (zero network calls)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_DIR = "aqi_cache"
+CACHE_TTL = 3600                 # Seconds an entry counts as fresh
+CACHE_MAX_BYTES = 5 * 1024 * 1024  # LRU-evict beyond this total size
+
+
+def hour_bucket(timestamp=None):
+    """Open-Meteo refreshes `current` hourly - one bucket per UTC hour"""
+    return int((time.time() if timestamp is None else timestamp) // 3600)
+
+
+class AQICache:
+    def __init__(self, directory=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, lat, lon, param, bucket):
+        key = f"{float(lat):.4f},{float(lon):.4f},{param},{bucket}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None  # Missing or half-written by a crashed run - treat as a miss
+
+    def get(self, lat, lon, param="us_aqi"):
+        """Fresh cached value for this hour, or None on a miss / expired entry"""
+        path = self._path(lat, lon, param, hour_bucket())
+        entry = self._read(path)
+        if entry is None or time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return entry["value"]
+
+    def put(self, lat, lon, param, value):
+        """Atomically store a value: readers never see a partially written file"""
+        now = time.time()
+        entry = {"lat": float(lat), "lon": float(lon), "param": param,
+                 "bucket": hour_bucket(now), "fetched_at": now, "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, self._path(lat, lon, param, entry["bucket"]))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def latest(self, param="us_aqi"):
+        """{(lat, lon): value} from the newest entry per location, ignoring TTL (replay)"""
+        newest = {}
+        for entry in self._entries():
+            if entry["param"] != param:
+                continue
+            key = (round(entry["lat"], 4), round(entry["lon"], 4))
+            if key not in newest or entry["fetched_at"] > newest[key]["fetched_at"]:
+                newest[key] = entry
+        return {key: entry["value"] for key, entry in newest.items()}
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(".json"):
+                    entry = self._read(item.path)
+                    if entry is not None:
+                        yield entry
+
+    def prune(self):
+        """Evict least-recently-used entries until the cache fits in max_bytes"""
+        with os.scandir(self.directory) as it:
+            files = [(item.stat().st_mtime, item.stat().st_size, item.path)
+                     for item in it if item.name.endswith(".json")]
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,172 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: Vectorized US EPA AQI from raw pollutant concentrations
+Computes sub-indices + overall AQI for whole hourly histories at once
+(NumPy, no Python loops) and reports which pollutant drives each value.
+-----------------------------------------------------------------------
+
+• Official EPA breakpoint tables (PM2.5 as revised in 2024)
+• Proper averaging windows: PM 24h, O3 8h (+1h), CO 8h, NO2/SO2 1h
+• Category + color assigned in the same vectorized pass
+• Input arrays may be 1-D (hours) or N-D (sites x hours) - hours last
+
+Units expected by compute_us_aqi(): PM in ug/m3, O3 & CO in ppm,
+NO2 & SO2 in ppb. Open-Meteo reports every gas in ug/m3 - use
+from_open_meteo_hourly() to convert.
+
+📦 pip install numpy
+"""
+
+from dataclasses import dataclass
+import time
+
+import numpy as np
+
+# --- BREAKPOINT TABLES: (C_low, C_high, I_low, I_high) ---
+# Concentrations are truncated to the table precision before lookup (EPA rule).
+BREAKPOINTS = {
+    "pm2_5_24h": (1, [(0.0, 9.0, 0, 50), (9.1, 35.4, 51, 100), (35.5, 55.4, 101, 150),
+                      (55.5, 125.4, 151, 200), (125.5, 225.4, 201, 300), (225.5, 325.4, 301, 500)]),
+    "pm10_24h": (0, [(0, 54, 0, 50), (55, 154, 51, 100), (155, 254, 101, 150),
+                     (255, 354, 151, 200), (355, 424, 201, 300), (425, 604, 301, 500)]),
+    "o3_8h": (3, [(0.000, 0.054, 0, 50), (0.055, 0.070, 51, 100), (0.071, 0.085, 101, 150),
+                  (0.086, 0.105, 151, 200), (0.106, 0.200, 201, 300)]),
+    "o3_1h": (3, [(0.125, 0.164, 101, 150), (0.165, 0.204, 151, 200),
+                  (0.205, 0.404, 201, 300), (0.405, 0.604, 301, 500)]),
+    "co_8h": (1, [(0.0, 4.4, 0, 50), (4.5, 9.4, 51, 100), (9.5, 12.4, 101, 150),
+                  (12.5, 15.4, 151, 200), (15.5, 30.4, 201, 300), (30.5, 50.4, 301, 500)]),
+    "so2_1h": (0, [(0, 35, 0, 50), (36, 75, 51, 100), (76, 185, 101, 150), (186, 304, 151, 200)]),
+    "so2_24h": (0, [(305, 604, 201, 300), (605, 1004, 301, 500)]),
+    "no2_1h": (0, [(0, 53, 0, 50), (54, 100, 51, 100), (101, 360, 101, 150),
+                   (361, 649, 151, 200), (650, 1249, 201, 300), (1250, 2049, 301, 500)]),
+}
+
+POLLUTANTS = ["pm2_5", "pm10", "o3", "no2", "so2", "co"]
+
+# --- CATEGORIES (US EPA Official Colors) ---
+CATEGORY_UPPER = np.array([50, 100, 150, 200, 300])
+CATEGORIES = np.array(["Good", "Moderate", "Unhealthy for Sensitive Groups",
+                       "Unhealthy", "Very Unhealthy", "Hazardous", "No data"])
+COLORS = np.array(["#00E400", "#FFFF00", "#FF7E00", "#FF0000", "#8F3F97", "#7E0023", "#BBBBBB"])
+LABELS = ["Good (0-50)", "Moderate (51-100)", "Sensitive (101-150)",
+          "Unhealthy (151-200)", "Very Unhealthy (201-300)", "Hazardous (300+)"]
+
+# ug/m3 → ppb at 25 °C: ppb = ug/m3 * 24.45 / molecular weight
+MOLAR_VOLUME = 24.45
+MOLECULAR_WEIGHT = {"o3": 48.00, "no2": 46.01, "so2": 64.07, "co": 28.01}
+
+# Open-Meteo hourly variable names (all reported in ug/m3)
+HOURLY_PARAMS = "pm2_5,pm10,ozone,nitrogen_dioxide,sulphur_dioxide,carbon_monoxide"
+
+
+@dataclass
+class AQIResult:
+    """Overall AQI plus everything needed to audit it (arrays share one shape)"""
+    aqi: np.ndarray           # float, NaN where no pollutant had enough data
+    sub_indices: dict         # pollutant → sub-index array
+    dominant: np.ndarray      # name of the pollutant that sets the AQI ("" if none)
+    category_code: np.ndarray  # 0 = Good ... 5 = Hazardous, 6 = No data
+    category: np.ndarray
+    color: np.ndarray
+
+
+def rolling_mean(values, window, min_fraction=0.75):
+    """Trailing mean over the last axis; NaN unless >=75% of the window has data"""
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    sums = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=-1)], axis=-1)
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=-1)], axis=-1)
+
+    end = np.arange(1, values.shape[-1] + 1)
+    start = np.maximum(end - window, 0)
+    window_sums = sums[..., end] - sums[..., start]
+    window_counts = counts[..., end] - counts[..., start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(window_counts >= np.ceil(min_fraction * window),
+                        window_sums / window_counts, np.nan)
+
+
+def sub_index(concentration, table):
+    """EPA linear interpolation inside the breakpoint row each value falls in"""
+    decimals, rows = BREAKPOINTS[table]
+    rows = np.array(rows, dtype=float)
+    scale = 10 ** decimals
+    c = np.floor(np.asarray(concentration, dtype=float) * scale + 1e-9) / scale
+
+    # Truncated values never fall inside the gaps between rows (e.g. 9.0 → 9.1),
+    # so one piecewise-linear np.interp over all rows is exact; above the top it caps at 500
+    index = np.rint(np.interp(c, rows[:, :2].ravel(), rows[:, 2:].ravel()))
+    # Below the first row (e.g. 1h O3 < 0.125 ppm) the table does not apply
+    return np.where(c < rows[0, 0], np.nan, index)
+
+
+def categorize(aqi):
+    """(codes, names, colors) for AQI values in one vectorized lookup"""
+    aqi = np.asarray(aqi, dtype=float)
+    codes = np.searchsorted(CATEGORY_UPPER, aqi, side="left")
+    codes = np.where(np.isnan(aqi), len(CATEGORIES) - 1, codes)
+    return codes, CATEGORIES[codes], COLORS[codes]
+
+
+def compute_us_aqi(pm2_5=None, pm10=None, o3=None, no2=None, so2=None, co=None):
+    """Overall US AQI for hourly series (hours on the last axis, EPA units)"""
+    hourly = {"pm2_5": pm2_5, "pm10": pm10, "o3": o3, "no2": no2, "so2": so2, "co": co}
+    shape = next(np.shape(v) for v in hourly.values() if v is not None)
+    missing = np.full(shape, np.nan)
+    hourly = {name: missing if v is None else np.asarray(v, dtype=float)
+              for name, v in hourly.items()}
+
+    subs = {
+        "pm2_5": sub_index(rolling_mean(hourly["pm2_5"], 24), "pm2_5_24h"),
+        "pm10": sub_index(rolling_mean(hourly["pm10"], 24), "pm10_24h"),
+        # O3: the 8h index, or the 1h index where that one is higher (EPA rule)
+        "o3": np.fmax(sub_index(rolling_mean(hourly["o3"], 8), "o3_8h"),
+                      sub_index(hourly["o3"], "o3_1h")),
+        "no2": sub_index(hourly["no2"], "no2_1h"),
+        # SO2: 1h table up to 304 ppb, 24h table above that
+        "so2": np.fmax(sub_index(hourly["so2"], "so2_1h"),
+                       sub_index(rolling_mean(hourly["so2"], 24), "so2_24h")),
+        "co": sub_index(rolling_mean(hourly["co"], 8), "co_8h"),
+    }
+
+    stacked = np.stack([subs[name] for name in POLLUTANTS])
+    no_data = np.all(np.isnan(stacked), axis=0)
+    leader = np.argmax(np.where(np.isnan(stacked), -1.0, stacked), axis=0)
+    aqi = np.where(no_data, np.nan, np.take_along_axis(stacked, leader[None], axis=0)[0])
+    dominant = np.where(no_data, "", np.array(POLLUTANTS)[leader])
+
+    codes, names, colors = categorize(aqi)
+    return AQIResult(aqi, subs, dominant, codes, names, colors)
+
+
+def from_open_meteo_hourly(hourly):
+    """Open-Meteo `hourly` block (ug/m3 everywhere) → compute_us_aqi() keyword args"""
+    def series(key):
+        return np.array([np.nan if v is None else v for v in hourly.get(key, [])], dtype=float)
+
+    def to_ppb(key, gas):
+        return series(key) * MOLAR_VOLUME / MOLECULAR_WEIGHT[gas]
+
+    return {
+        "pm2_5": series("pm2_5"),
+        "pm10": series("pm10"),
+        "o3": to_ppb("ozone", "o3") / 1000,            # ppm
+        "no2": to_ppb("nitrogen_dioxide", "no2"),      # ppb
+        "so2": to_ppb("sulphur_dioxide", "so2"),       # ppb
+        "co": to_ppb("carbon_monoxide", "co") / 1000,  # ppm
+    }
+
+
+if __name__ == "__main__":
+    # ⏱️ Quick speed check: 1,000 sites x 30 days of hourly data (720k values per pollutant)
+    rng = np.random.default_rng(42)
+    shape = (1000, 24 * 30)
+    start = time.perf_counter()
+    result = compute_us_aqi(pm2_5=rng.gamma(2, 20, shape), pm10=rng.gamma(2, 40, shape),
+                            o3=rng.gamma(2, 0.02, shape), no2=rng.gamma(2, 20, shape),
+                            so2=rng.gamma(2, 10, shape), co=rng.gamma(2, 0.8, shape))
+    elapsed = time.perf_counter() - start
+    drivers, counts = np.unique(result.dominant, return_counts=True)
+    print(f"⚡ {result.aqi.size:,} hourly AQI values in {elapsed:.3f} s")
+    print("🔎 Dominant pollutant:", dict(zip(drivers.tolist(), counts.tolist())))
@@ -0,0 +1,196 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: Lightweight instrumentation for the AQI monitor
+Tells whether a slow run came from the API, from DNS or from matplotlib.
+-----------------------------------------------------------------------
+
+• Per-city records: request latency, bytes, retries, failure reason
+• Per-stage wall + CPU time (with METRICS.stage("plot"): ...)
+• Histograms aggregated in memory (thread-safe, no dependencies)
+• Export: JSON summary + Prometheus text format (textfile collector)
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import tempfile
+import threading
+import time
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)          # seconds
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)      # bytes
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self):
+        return {"count": self.count, "sum": round(self.sum, 6),
+                "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)}}
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.cities = {}       # city → latest record
+            self.stages = {}       # stage → {"wall_s", "cpu_s", "runs"}
+            self.counters = {"requests": 0, "bytes": 0, "retries": 0,
+                             "request_errors": 0, "city_failures": 0}
+            self.request_errors = {}     # reason → count (failed HTTP requests/batches)
+            self.failure_reasons = {}    # reason → count (cities that ended without data)
+            self.histograms = {"request_seconds": Histogram(LATENCY_BUCKETS),
+                               "response_bytes": Histogram(BYTES_BUCKETS)}
+            self.stage_histograms = {}
+
+    # --- RECORDING ---
+    def record_request(self, latency, nbytes, retries=0, error=None):
+        """One HTTP request (single city or a whole batch)"""
+        with self.lock:
+            self.counters["requests"] += 1
+            self.counters["bytes"] += nbytes
+            self.counters["retries"] += retries
+            self.histograms["request_seconds"].observe(latency)
+            self.histograms["response_bytes"].observe(nbytes)
+            if error:
+                self.counters["request_errors"] += 1
+                _bump(self.request_errors, error)
+
+    def record_city(self, city, latency, nbytes, retries=0, error=None, aqi=None):
+        """Outcome for one city; latency/bytes are its share of the request that carried it"""
+        with self.lock:
+            self.cities[city] = {"latency_s": round(latency, 6), "bytes": nbytes,
+                                 "retries": retries, "error": error, "aqi": aqi}
+            if error:
+                self.counters["city_failures"] += 1
+                _bump(self.failure_reasons, error)
+
+    @contextmanager
+    def stage(self, name):
+        """Wall and CPU time of a pipeline stage (fetch, dataframe, plot, csv, ...)"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            with self.lock:
+                stats = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0, "runs": 0})
+                stats["wall_s"] += wall
+                stats["cpu_s"] += cpu
+                stats["runs"] += 1
+                self.stage_histograms.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(wall)
+
+    # --- EXPORT ---
+    def summary(self):
+        with self.lock:
+            return {
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "counters": dict(self.counters),
+                "request_errors": dict(self.request_errors),
+                "failure_reasons": dict(self.failure_reasons),
+                "stages": {name: {k: round(v, 6) if isinstance(v, float) else v
+                                  for k, v in stats.items()}
+                           for name, stats in self.stages.items()},
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+                "stage_histograms": {name: h.to_dict() for name, h in self.stage_histograms.items()},
+                "cities": dict(self.cities),
+            }
+
+    def to_json(self, path):
+        _atomic_write(path, json.dumps(self.summary(), indent=2, ensure_ascii=False))
+
+    def to_prometheus(self, path):
+        """Prometheus text exposition format (node_exporter textfile collector friendly)"""
+        with self.lock:
+            lines = []
+
+            def histogram(name, help_text, hist, labels="", header=True):
+                if header:
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} histogram")
+                sep = "," if labels else ""
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {hist.count}')
+                braces = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{braces} {hist.sum}")
+                lines.append(f"{name}_count{braces} {hist.count}")
+
+            histogram("aqi_request_seconds", "Open-Meteo request latency.",
+                      self.histograms["request_seconds"])
+            histogram("aqi_response_bytes", "Open-Meteo response body size.",
+                      self.histograms["response_bytes"])
+
+            for name, help_text in (("requests", "HTTP requests sent."),
+                                    ("bytes", "Response bytes received."),
+                                    ("retries", "Request retries.")):
+                lines.append(f"# HELP aqi_{name}_total {help_text}")
+                lines.append(f"# TYPE aqi_{name}_total counter")
+                lines.append(f"aqi_{name}_total {self.counters[name]}")
+
+            for name, help_text, reasons in (
+                    ("request_errors", "Failed HTTP requests by reason.", self.request_errors),
+                    ("city_failures", "Cities left without data by reason.", self.failure_reasons)):
+                lines.append(f"# HELP aqi_{name}_total {help_text}")
+                lines.append(f"# TYPE aqi_{name}_total counter")
+                for reason, count in sorted(reasons.items()):
+                    lines.append(f'aqi_{name}_total{{reason="{_escape(reason)}"}} {count}')
+
+            for kind in ("wall", "cpu"):
+                lines.append(f"# HELP aqi_stage_{kind}_seconds_total Accumulated {kind} time per stage.")
+                lines.append(f"# TYPE aqi_stage_{kind}_seconds_total counter")
+                for name, stats in sorted(self.stages.items()):
+                    lines.append(f'aqi_stage_{kind}_seconds_total{{stage="{name}"}} '
+                                 f'{stats[kind + "_s"]:.6f}')
+            for i, (name, hist) in enumerate(sorted(self.stage_histograms.items())):
+                histogram("aqi_stage_seconds", "Stage wall time.", hist, f'stage="{name}"',
+                          header=(i == 0))
+
+        _atomic_write(path, "\n".join(lines) + "\n")
+
+    def report(self):
+        """One console line per stage plus the network totals"""
+        with self.lock:
+            for name, stats in self.stages.items():
+                print(f"⏱️  {name:<10} wall {stats['wall_s']:.3f}s | cpu {stats['cpu_s']:.3f}s")
+            c = self.counters
+            print(f"🌐 {c['requests']} requests | {c['bytes'] / 1024:.1f} KB | "
+                  f"{c['retries']} retries | {c['request_errors']} request errors | "
+                  f"{c['city_failures']} cities without data")
+
+
+def _bump(reasons, error):
+    key = error.split(":")[0]   # "ConnectionError: ..." → "ConnectionError"
+    reasons[key] = reasons.get(key, 0) + 1
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _atomic_write(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.replace(tmp_path, path)
+
+
+# Shared registry used by india_aqi_monitor
+METRICS = Metrics()
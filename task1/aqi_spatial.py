@@ -0,0 +1,122 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: Spatial AQI heatmap for India (Inverse-Distance Weighting)
+Estimates AQI between monitored cities from station values - no extra
+API calls for the grid points.
+-----------------------------------------------------------------------
+
+• KD-tree (scipy cKDTree) finds the k nearest stations per grid cell
+• IDW weights computed with NumPy over whole chunks of the grid at once
+• 10^6 cells x thousands of stations in a few seconds
+• Heatmap uses the same US EPA color bands as the bar dashboard
+
+📦 pip install numpy scipy matplotlib
+"""
+
+import time
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from aqi_epa import COLORS, LABELS
+
+# Mainland India bounding box (degrees)
+INDIA_BOUNDS = (6.5, 37.5, 68.0, 97.5)   # lat_min, lat_max, lon_min, lon_max
+GRID_STEP = 0.05        # Degrees per cell → ~620 x 590 = 366k cells
+NEIGHBOURS = 8          # Stations blended per cell
+POWER = 2               # IDW distance exponent
+CHUNK_CELLS = 250_000   # Cells per KD-tree query (bounds peak memory)
+HEATMAP_FILE = "india_aqi_heatmap_aditya.png"
+
+
+def make_grid(bounds=INDIA_BOUNDS, step=GRID_STEP):
+    """1-D latitude and longitude axes of the interpolation grid"""
+    lat_min, lat_max, lon_min, lon_max = bounds
+    return np.arange(lat_min, lat_max + step / 2, step), np.arange(lon_min, lon_max + step / 2, step)
+
+
+def _project(lat, lon, ref_lat):
+    """Equirectangular projection so KD-tree distances are ~proportional to km"""
+    return np.column_stack([np.asarray(lon) * np.cos(np.radians(ref_lat)), np.asarray(lat)])
+
+
+def idw_grid(lats, lons, values, grid_lats, grid_lons, k=NEIGHBOURS, power=POWER,
+             max_distance=np.inf, chunk=CHUNK_CELLS):
+    """Interpolate station values onto the (grid_lats x grid_lons) grid; returns a 2-D array"""
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        raise ValueError("idw_grid needs at least one station")
+    ref_lat = float(np.mean(grid_lats))
+    tree = cKDTree(_project(lats, lons, ref_lat))
+    k = min(k, len(values))
+
+    cell_lon, cell_lat = np.meshgrid(grid_lons, grid_lats)
+    cells = _project(cell_lat.ravel(), cell_lon.ravel(), ref_lat)
+    out = np.empty(len(cells))
+
+    for start in range(0, len(cells), chunk):
+        dist, idx = tree.query(cells[start:start + chunk], k=k,
+                               distance_upper_bound=max_distance, workers=-1)
+        if k == 1:
+            dist, idx = dist[:, None], idx[:, None]
+        found = np.isfinite(dist)   # Neighbours beyond max_distance come back as inf
+        neighbour_values = values[np.where(found, idx, 0)]
+
+        with np.errstate(divide="ignore"):
+            weights = np.where(found, 1.0 / dist ** power, 0.0)
+        exact = dist[:, 0] == 0     # Cell sits on a station → take its value as-is
+        weights[exact] = 0.0
+        weights[exact, 0] = 1.0
+
+        total = weights.sum(axis=1)
+        with np.errstate(invalid="ignore"):
+            out[start:start + chunk] = np.where(
+                total > 0, (weights * neighbour_values).sum(axis=1) / total, np.nan)
+
+    return out.reshape(len(grid_lats), len(grid_lons))
+
+
+def render_heatmap(grid, grid_lats, grid_lons, stations=None, path=HEATMAP_FILE, headless=False):
+    """Draw the interpolated grid in EPA colors (+ station dots) and save it"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import BoundaryNorm, ListedColormap
+    from matplotlib.patches import Patch
+
+    cmap = ListedColormap(COLORS[:len(LABELS)])
+    norm = BoundaryNorm([0, 50.5, 100.5, 150.5, 200.5, 300.5, 10_000], cmap.N)
+
+    fig, ax = plt.subplots(figsize=(11, 12))
+    ax.imshow(grid, origin="lower", cmap=cmap, norm=norm, alpha=0.85, interpolation="nearest",
+              extent=(grid_lons[0], grid_lons[-1], grid_lats[0], grid_lats[-1]))
+    if stations is not None:
+        ax.scatter(stations["Lon"], stations["Lat"], c="black", s=12)
+        for _, lat, lon, name in stations[["Lat", "Lon", "City"]].itertuples():
+            ax.annotate(name, (lon, lat), xytext=(3, 3), textcoords="offset points", fontsize=8)
+
+    ax.set_title("🇮🇳 INDIA AQI HEATMAP (IDW interpolation)\n"
+                 + time.strftime("Updated: %Y-%m-%d %H:%M IST"), fontsize=16, fontweight='bold')
+    ax.set_xlabel("Longitude")
+    ax.set_ylabel("Latitude")
+    ax.legend([Patch(color=c) for c in COLORS[:len(LABELS)]], LABELS,
+              title="US EPA Health Risk", loc="lower left", fontsize=9)
+    fig.savefig(path, dpi=150, bbox_inches="tight", facecolor="white")
+    return fig
+
+
+if __name__ == "__main__":
+    # ⏱️ Scale check: 2,000 random stations onto a 1000 x 1000 grid (10^6 cells)
+    rng = np.random.default_rng(7)
+    lat_min, lat_max, lon_min, lon_max = INDIA_BOUNDS
+    station_lats = rng.uniform(lat_min, lat_max, 2000)
+    station_lons = rng.uniform(lon_min, lon_max, 2000)
+    station_aqi = rng.uniform(20, 300, 2000)
+    grid_lats = np.linspace(lat_min, lat_max, 1000)
+    grid_lons = np.linspace(lon_min, lon_max, 1000)
+
+    start = time.perf_counter()
+    grid = idw_grid(station_lats, station_lons, station_aqi, grid_lats, grid_lons)
+    print(f"⚡ {grid.size:,} cells from {len(station_aqi):,} stations in "
+          f"{time.perf_counter() - start:.2f} s")
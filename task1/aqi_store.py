@@ -0,0 +1,111 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: Append-only AQI time-series store (Parquet, partitioned by day)
+Keeps every poll so trends can be analysed over months for hundreds of
+cities - without re-reading one ever-growing CSV.
+-----------------------------------------------------------------------
+
+Layout:  aqi_history/date=2026-01-30/1400.parquet   (one file per timestamp)
+
+• Past files are never rewritten - a poll only touches its own timestamp file
+• Deduplicated on (City, Timestamp): re-polling inside the same hour
+  replaces that hour's row instead of adding a copy
+• Range queries open only the day folders + timestamp files in range and
+  push the city filter down into the Parquet reader
+
+📦 pip install pandas pyarrow
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import timedelta
+
+import pandas as pd
+
+STORE_DIR = "aqi_history"
+TIMEZONE = "Asia/Kolkata"
+RESOLUTION = "h"   # Open-Meteo's `current` value changes hourly
+
+
+def current_timestamp():
+    """Poll time in IST (naive), floored to the store resolution"""
+    return pd.Timestamp.now(tz=TIMEZONE).tz_localize(None).floor(RESOLUTION)
+
+
+class AQIStore:
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, timestamp):
+        day_dir = os.path.join(self.directory, f"date={timestamp:%Y-%m-%d}")
+        return day_dir, os.path.join(day_dir, f"{timestamp:%H%M}.parquet")
+
+    def append(self, df, timestamp=None):
+        """Store one poll (City, AQI, ...) under its timestamp; returns rows written"""
+        timestamp = current_timestamp() if timestamp is None else pd.Timestamp(timestamp).floor(RESOLUTION)
+        day_dir, path = self._path(timestamp)
+        os.makedirs(day_dir, exist_ok=True)
+
+        poll = df.assign(Timestamp=timestamp)
+        if os.path.exists(path):  # Same hour polled again → newest reading wins
+            poll = pd.concat([pd.read_parquet(path), poll], ignore_index=True)
+        poll = poll.drop_duplicates(["City", "Timestamp"], keep="last").reset_index(drop=True)
+
+        # Atomic write: readers never see a half-written Parquet file
+        fd, tmp_path = tempfile.mkstemp(dir=day_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            poll.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return len(poll)
+
+    def _files(self, start, end):
+        """Timestamp files inside [start, end] - decided from names, nothing is opened"""
+        day = start.normalize()
+        while day <= end:
+            day_dir = os.path.join(self.directory, f"date={day:%Y-%m-%d}")
+            if os.path.isdir(day_dir):
+                for name in sorted(os.listdir(day_dir)):
+                    if not name.endswith(".parquet"):
+                        continue
+                    stamp = day + timedelta(hours=int(name[:2]), minutes=int(name[2:4]))
+                    if start <= stamp <= end:
+                        yield os.path.join(day_dir, name)
+            day += timedelta(days=1)
+
+    def query(self, city=None, start=None, end=None, columns=None):
+        """Readings between start and end (inclusive), optionally for one city"""
+        end = current_timestamp() if end is None else pd.Timestamp(end)
+        start = end - timedelta(days=1) if start is None else pd.Timestamp(start)
+        filters = [("City", "==", city)] if city else None
+        # Timestamp is always read: results are sorted by it, then dropped if not asked for
+        read = columns if columns is None or "Timestamp" in columns else [*columns, "Timestamp"]
+
+        frames = [pd.read_parquet(path, columns=read, filters=filters)
+                  for path in self._files(start, end)]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame(columns=columns or ["City", "AQI", "Timestamp"])
+        history = pd.concat(frames, ignore_index=True).sort_values("Timestamp", ignore_index=True)
+        return history if read is columns else history[columns]
+
+    def last(self, city=None, hours=24):
+        """Shortcut for the common 'last N hours' question"""
+        end = current_timestamp()
+        return self.query(city, end - timedelta(hours=hours), end)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the INDI-AIR AQI history")
+    parser.add_argument("city", nargs="?", help="city name (default: all cities)")
+    parser.add_argument("--hours", type=int, default=24, help="look-back window (default 24)")
+    parser.add_argument("--store", default=STORE_DIR, help=f"store folder (default {STORE_DIR})")
+    args = parser.parse_args()
+
+    history = AQIStore(args.store).last(args.city, args.hours)
+    print(history.to_string(index=False) if len(history) else "No readings in that window.")
@@ -0,0 +1,217 @@
+"""
+-----------------------------------------------------------------------
+INDI-AIR: Offline benchmark for the AQI pipeline
+Drives fetch → dataframe → render against a local fake Open-Meteo
+server, so fetch-engine changes can be measured repeatably without the
+internet.
+-----------------------------------------------------------------------
+
+• Stub server mimics /v1/air-quality (single + multi-location responses)
+  with configurable latency, jitter and error rate
+• Runs every stage at 25 / 500 / 5,000 locations (configurable)
+• Reports throughput, p50/p95/p99 latency and peak RSS as JSON
+• --compare old.json prints the slowdown/speedup per stage
+
+USAGE:  python bench_aqi.py --output bench.json
+        python bench_aqi.py --engine async --compare bench.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import india_aqi_monitor as monitor
+
+SIZES = [25, 500, 5000]
+REPEATS = 5
+MAX_LOCATIONS = 1000   # Open-Meteo rejects bigger multi-location requests
+
+
+# --- FAKE OPEN-METEO SERVER ---
+class StubAirQualityHandler(BaseHTTPRequestHandler):
+    """Answers /v1/air-quality like Open-Meteo: one object, or a list for many locations"""
+    protocol_version = "HTTP/1.1"   # Keep-alive, like the real API (every reply sets Content-Length)
+    latency = 0.05
+    jitter = 0.02
+    error_rate = 0.0
+    request_times = []   # Server-side service time per request (seconds)
+    lock = threading.Lock()
+
+    def do_GET(self):
+        started = time.perf_counter()
+        query = parse_qs(urlparse(self.path).query)
+        lats = query.get("latitude", [""])[0].split(",")
+        lons = query.get("longitude", [""])[0].split(",")
+        time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+        if random.random() < self.error_rate:
+            self._reply(500, {"error": True, "reason": "injected failure"})
+        elif len(lats) != len(lons) or not lats[0] or len(lats) > MAX_LOCATIONS:
+            self._reply(400, {"error": True, "reason": "bad latitude/longitude list"})
+        else:
+            # Deterministic fake AQI per coordinate so runs are comparable
+            items = [{"latitude": float(lat), "longitude": float(lon),
+                      "current": {"time": time.strftime("%Y-%m-%dT%H:00"), "interval": 3600,
+                                  "us_aqi": zlib.crc32(f"{lat},{lon}".encode()) % 300 + 10}}
+                     for lat, lon in zip(lats, lons)]
+            self._reply(200, items if len(items) > 1 else items[0])
+
+        with self.lock:
+            self.request_times.append(time.perf_counter() - started)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass   # Keep benchmark output clean
+
+
+class StubAirQualityServer(ThreadingHTTPServer):
+    """Listen backlog sized for the async engine's burst of connections (default is 5)"""
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def start_stub_server(latency, jitter, error_rate):
+    """Start the fake API on a free localhost port; returns (server, base URL)"""
+    StubAirQualityHandler.latency = latency
+    StubAirQualityHandler.jitter = jitter
+    StubAirQualityHandler.error_rate = error_rate
+    server = StubAirQualityServer(("127.0.0.1", 0), StubAirQualityHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/air-quality"
+
+
+# --- HELPERS ---
+def fake_locations(count, seed=0):
+    """`count` synthetic monitoring points spread over India"""
+    rng = random.Random(seed)
+    return [(f"Site-{i:05d}", round(rng.uniform(8, 34), 2), round(rng.uniform(69, 95), 2))
+            for i in range(count)]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "p99": None}
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 6)
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def peak_rss_mb():
+    """Process high-water mark so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_stage(fn, repeats, items):
+    """Time `fn` `repeats` times; returns (stats, last result)"""
+    durations, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    best = min(durations)
+    return {"runs": repeats, "wall_s": percentiles(durations),
+            "throughput_per_s": round(items / best, 1) if best else None,
+            "peak_rss_mb": peak_rss_mb()}, result
+
+
+# --- BENCHMARK ---
+def benchmark(sizes=SIZES, repeats=REPEATS, engine="threads", latency=0.05, jitter=0.02,
+              error_rate=0.0, render=True):
+    server, url = start_stub_server(latency, jitter, error_rate)
+    monitor.API_URL = url
+    monitor.FETCH_ENGINE = engine
+    monitor.SESSION.mount("http://", monitor.SESSION.get_adapter("https://"))
+    chart_path = tempfile.NamedTemporaryFile(suffix=".png", delete=False).name
+
+    report = {"engine": engine, "batch_size": monitor.BATCH_SIZE, "latency_s": latency,
+              "jitter_s": jitter, "error_rate": error_rate, "sizes": {}}
+    try:
+        for size in sizes:
+            cities = fake_locations(size)
+            StubAirQualityHandler.request_times.clear()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                fetch_stats, rows = run_stage(lambda: monitor.fetch(cities), repeats, size)
+            fetch_stats["requests_per_run"] = len(StubAirQualityHandler.request_times) // repeats
+            fetch_stats["request_latency_s"] = percentiles(StubAirQualityHandler.request_times)
+            fetch_stats["rows"] = len(rows)
+
+            df_stats, df = run_stage(lambda: monitor.build_dataframe(rows), repeats, len(rows))
+            stages = {"fetch": fetch_stats, "dataframe": df_stats}
+
+            if render:
+                def render_once():
+                    dashboard = monitor.AQIDashboard(headless=True)
+                    dashboard.update(df)
+                    dashboard.save(chart_path, dpi=monitor.LIVE_DPI)
+                    dashboard.plt.close(dashboard.fig)
+                stages["render"], _ = run_stage(render_once, repeats, len(df))
+
+            report["sizes"][str(size)] = stages
+            print(f"⏱️  {size:>5} locations | fetch p50 {fetch_stats['wall_s']['p50']:.3f}s | "
+                  f"{fetch_stats['throughput_per_s']} loc/s | RSS {peak_rss_mb()} MB",
+                  file=sys.stderr)
+    finally:
+        server.shutdown()
+    return report
+
+
+def compare(report, baseline):
+    """Print p50 wall-time ratios (new / old) per size and stage"""
+    print("\n📊 p50 wall time vs baseline (x < 1.00 = faster)")
+    for size, stages in report["sizes"].items():
+        for stage, stats in stages.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(stage)
+            if old and old["wall_s"]["p50"]:
+                ratio = stats["wall_s"]["p50"] / old["wall_s"]["p50"]
+                flag = "🔴" if ratio > 1.10 else "🟢"
+                print(f"{flag} {size:>5} {stage:<10} x{ratio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline INDI-AIR pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="stub latency std-dev (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 replies")
+    parser.add_argument("--no-render", action="store_true", help="skip the matplotlib stage")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier JSON report to compare")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.sizes, args.repeats, args.engine, args.latency, args.jitter,
+                       args.error_rate, not args.no_render)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text)
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,17 +12,35 @@ Fetches LIVE AQI for 25+ Major Indian Cities | Open-Meteo API (Free)
 • Color-coded AQI (US EPA Standards) 
 • Auto-save chart & CSV data
 • Runs in <10 seconds!
+• Importable API: fetch → build_dataframe → AQIDashboard (plotting loads lazily)
+• --headless for servers (Agg, no window) | --live keeps ONE figure updating
+• --spatial: IDW heatmap of AQI between cities (KD-tree, needs scipy)
+• --metrics-json / --prometheus: per-stage & per-city timings, bytes, retries
+• --local-aqi: fetch raw hourly pollutants and compute the US AQI here (aqi_epa)
 
-📦 pip install requests pandas seaborn matplotlib
+📦 pip install requests pandas numpy seaborn matplotlib
+   (optional: pip install aiohttp  → FETCH_ENGINE = "async")
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 from concurrent.futures import ThreadPoolExecutor
 import time
-from matplotlib.patches import Patch
+import argparse
+import asyncio
+import json
+import socket
+from urllib.parse import urlparse
+from bisect import bisect_right
+import random
+from dataclasses import dataclass
+from aqi_cache import AQICache, CACHE_TTL
+from aqi_store import AQIStore, STORE_DIR
+from aqi_epa import (categorize, compute_us_aqi, from_open_meteo_hourly, COLORS,
+                     HOURLY_PARAMS, LABELS)
+from aqi_metrics import METRICS
 
 # API & 25+ Major Indian Cities (Ready-to-run)
 API_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
@@ -45,93 +63,513 @@ CITIES = [
     ("Indore", 22.72, 75.86), ("Bhopal", 23.25, 77.41), ("Raipur", 21.25, 81.63)
 ]
 
+# ⚡ Batched fetching: Open-Meteo accepts comma-separated lat/lon lists,
+# so one request can carry many cities (set BATCH_SIZE = 1 for per-city calls)
+BATCH_SIZE = 50
+MAX_WORKERS = 10
+
+# One pooled keep-alive session shared by every request (no repeated TLS handshakes)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS))
+
+# 🚀 Async engine (aiohttp): thousands of coordinates without thousands of threads
+FETCH_ENGINE = "threads"   # "threads" (requests + ThreadPoolExecutor) or "async"
+CONCURRENCY = 20           # Max in-flight requests
+REQUEST_DEADLINE = 10      # Seconds allowed per request (connect + response)
+MAX_RETRIES = 3            # Extra attempts after the first one
+BACKOFF_BASE = 0.5         # Seconds; doubled on every retry with random jitter
+
+# 🧪 Local AQI: request the raw hourly pollutants and run the EPA tables ourselves
+# (aqi_epa) instead of trusting Open-Meteo's us_aqi - yesterday + today covers the 24h means
+LOCAL_AQI = False
+
+def aqi_query():
+    """Query string for the AQI source LOCAL_AQI selects"""
+    if LOCAL_AQI:
+        return f"hourly={HOURLY_PARAMS}&past_days=1&forecast_days=1&timezone=Asia/Kolkata"
+    return "current=us_aqi&timezone=Asia/Kolkata"
+
+def aqi_param():
+    """Cache key for the AQI source (local values never mix with Open-Meteo's)"""
+    return "us_aqi_local" if LOCAL_AQI else "us_aqi"
+
+def batch_aqi(items):
+    """Current AQI for each location payload of one response (same order)"""
+    if not LOCAL_AQI:
+        return [item['current']['us_aqi'] for item in items]
+    # Every location in one response shares the hourly time axis → one sites x hours pass
+    series = [from_open_meteo_hourly(item['hourly']) for item in items]
+    result = compute_us_aqi(**{name: np.stack([s[name] for s in series]) for name in series[0]})
+    now = time.gmtime(time.time() + items[0].get('utc_offset_seconds', 0))
+    hour = bisect_right(items[0]['hourly']['time'], time.strftime("%Y-%m-%dT%H:%M", now)) - 1
+    if hour < 0:
+        raise ValueError("no hourly data up to the current hour")
+    return [None if np.isnan(aqi) else int(aqi) for aqi in result.aqi[:, hour]]
+
 def get_aqi(city_name, lat, lon):
     """Get live AQI for one city - Simple & Fast"""
+    started, nbytes = time.perf_counter(), 0
     try:
-        url = f"{API_URL}?latitude={lat}&longitude={lon}&current=us_aqi&timezone=Asia/Kolkata"
-        data = requests.get(url, timeout=8).json()
-        aqi = data['current']['us_aqi']
+        url = f"{API_URL}?latitude={lat}&longitude={lon}&{aqi_query()}"
+        response = SESSION.get(url, timeout=8)
+        nbytes = len(response.content)
+        aqi = batch_aqi([response.json()])[0]
+        latency = time.perf_counter() - started
+        METRICS.record_request(latency, nbytes)
+        METRICS.record_city(city_name, latency, nbytes, aqi=aqi)
         print(f"✅ {city_name}: {aqi}")
         return {"City": city_name, "AQI": aqi}
-    except:
+    except Exception as error:
+        latency, reason = time.perf_counter() - started, f"{type(error).__name__}: {error}"
+        METRICS.record_request(latency, nbytes, error=reason)
+        METRICS.record_city(city_name, latency, nbytes, error=reason)
         print(f"❌ {city_name} (no data)")
         return None
 
+def get_aqi_batch(cities):
+    """Get live AQI for a chunk of cities in ONE request (falls back to per-city calls)"""
+    started, nbytes = time.perf_counter(), 0
+    try:
+        lats = ",".join(str(lat) for _, lat, _ in cities)
+        lons = ",".join(str(lon) for _, _, lon in cities)
+        url = f"{API_URL}?latitude={lats}&longitude={lons}&{aqi_query()}"
+        response = SESSION.get(url, timeout=15)
+        nbytes = len(response.content)
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, dict):  # A single location comes back as a plain object
+            data = [data]
+        if len(data) != len(cities):
+            raise ValueError(f"expected {len(cities)} locations, got {len(data)}")
+
+        # Unpack the array response back into per-city rows (same order as the request)
+        latency = time.perf_counter() - started
+        METRICS.record_request(latency, nbytes)
+        rows = []
+        for (city_name, _, _), aqi in zip(cities, batch_aqi(data)):
+            METRICS.record_city(city_name, latency, nbytes // len(cities), aqi=aqi,
+                                error="no data" if aqi is None else None)
+            if aqi is None:
+                print(f"❌ {city_name} (no data)")
+                continue
+            print(f"✅ {city_name}: {aqi}")
+            rows.append({"City": city_name, "AQI": aqi})
+        return rows
+    except (requests.RequestException, ValueError, KeyError, TypeError) as error:
+        METRICS.record_request(time.perf_counter() - started, nbytes,
+                               error=f"{type(error).__name__}: {error}")
+        print(f"⚠️  Batch of {len(cities)} cities failed ({error}) - retrying one by one")
+        return [row for row in (get_aqi(*city) for city in cities) if row]
+
+def fetch_all(cities, batch_size=BATCH_SIZE):
+    """Split the city list into batches and fetch them in parallel over SESSION"""
+    chunks = [cities[i:i + batch_size] for i in range(0, len(cities), batch_size)]
+    data = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for rows in executor.map(get_aqi_batch, chunks):
+            data.extend(rows)
+    return data
+
+@dataclass
+class FetchResult:
+    """Typed outcome for one city: aqi on success, error says why it failed"""
+    city: str
+    lat: float
+    lon: float
+    aqi: float = None
+    error: str = None
+    attempts: int = 0
+    latency: float = 0.0   # Seconds for the request that carried this city
+    nbytes: int = 0        # This city's share of that response body
+
+    @property
+    def ok(self):
+        return self.error is None
+
+class TransientError(Exception):
+    """Retryable HTTP failure (429 Too Many Requests / 5xx)"""
+
+def _unpack_batch(cities, data, attempts, latency=0.0, nbytes=0):
+    """Turn a (multi-)location JSON payload into one FetchResult per city"""
+    share = nbytes // len(cities)
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list) or len(data) != len(cities):
+        return [FetchResult(name, lat, lon, error="malformed batch response", attempts=attempts,
+                            latency=latency, nbytes=share) for name, lat, lon in cities]
+
+    def item_aqi(item):
+        try:
+            return batch_aqi([item])[0]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+    try:
+        values = batch_aqi(data)
+    except (KeyError, TypeError, ValueError, AttributeError):   # Some location lacks data
+        values = [item_aqi(item) for item in data]
+
+    results = []
+    for (name, lat, lon), aqi in zip(cities, values):
+        results.append(FetchResult(name, lat, lon, aqi=aqi, attempts=attempts, latency=latency,
+                                   nbytes=share, error="no data" if aqi is None else None))
+    return results
+
+async def get_aqi_batch_async(session, semaphore, cities):
+    """Fetch one batch with a deadline and jittered exponential-backoff retries"""
+    import aiohttp
+
+    lats = ",".join(str(lat) for _, lat, _ in cities)
+    lons = ",".join(str(lon) for _, _, lon in cities)
+    url = f"{API_URL}?latitude={lats}&longitude={lons}&{aqi_query()}"
+
+    error = None
+    for attempt in range(1, MAX_RETRIES + 2):
+        started, nbytes = time.perf_counter(), 0
+        try:
+            async with semaphore:
+                async with session.get(url) as response:
+                    body = await response.read()
+                    nbytes = len(body)
+                    if response.status == 429 or response.status >= 500:
+                        raise TransientError(f"HTTP {response.status}")
+                    if response.status != 200:  # 4xx will not get better by retrying
+                        METRICS.record_request(time.perf_counter() - started, nbytes,
+                                               int(attempt > 1), f"HTTP {response.status}")
+                        return [FetchResult(name, lat, lon, error=f"HTTP {response.status}",
+                                            attempts=attempt) for name, lat, lon in cities]
+            data = json.loads(body)
+            latency = time.perf_counter() - started
+            METRICS.record_request(latency, nbytes, int(attempt > 1))
+            return _unpack_batch(cities, data, attempt, latency, nbytes)
+        except asyncio.TimeoutError:
+            error = f"timeout after {REQUEST_DEADLINE}s"
+        except (aiohttp.ClientError, TransientError, ValueError) as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        METRICS.record_request(time.perf_counter() - started, nbytes, int(attempt > 1), error)
+
+        if attempt <= MAX_RETRIES:
+            # "Full jitter" backoff keeps retries from hammering the API in lockstep
+            await asyncio.sleep(random.uniform(0, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+    return [FetchResult(name, lat, lon, error=error, attempts=MAX_RETRIES + 1)
+            for name, lat, lon in cities]
+
+async def fetch_all_async(cities, batch_size=BATCH_SIZE, concurrency=CONCURRENCY):
+    """Fetch every batch concurrently on one event loop; returns a FetchResult per city"""
+    import aiohttp
+
+    chunks = [cities[i:i + batch_size] for i in range(0, len(cities), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_DEADLINE)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        batches = await asyncio.gather(
+            *(get_aqi_batch_async(session, semaphore, chunk) for chunk in chunks))
+    return [result for batch in batches for result in batch]
+
+def fetch_rows_async(cities):
+    """Run the async engine and report each city like the threaded fetcher does"""
+    rows = []
+    for result in asyncio.run(fetch_all_async(cities)):
+        METRICS.record_city(result.city, result.latency, result.nbytes,
+                            max(result.attempts - 1, 0), result.error, result.aqi)
+        if result.ok:
+            print(f"✅ {result.city}: {result.aqi}")
+            rows.append({"City": result.city, "AQI": result.aqi})
+        else:
+            print(f"❌ {result.city} ({result.error}, {result.attempts} attempts)")
+    return rows
+
+def fetch(cities):
+    """Fetch live rows with whichever engine FETCH_ENGINE selects"""
+    if FETCH_ENGINE == "async":
+        return fetch_rows_async(cities)
+    return fetch_all(cities)
+
+def fetch_with_cache(cities, cache):
+    """Serve this hour's cached cities from disk and only fetch the misses"""
+    data, missing = [], []
+    for name, lat, lon in cities:
+        aqi = cache.get(lat, lon, aqi_param())
+        if aqi is None:
+            missing.append((name, lat, lon))
+        else:
+            print(f"💾 {name}: {aqi} (cached)")
+            data.append({"City": name, "AQI": aqi})
+
+    if missing:
+        coords = {name: (lat, lon) for name, lat, lon in missing}
+        for row in fetch(missing):
+            if row["AQI"] is not None:
+                cache.put(*coords[row["City"]], aqi_param(), row["AQI"])
+            data.append(row)
+        cache.prune()
+    return data
+
+def replay_from_cache(cities, cache):
+    """Offline replay: newest cached value per city, zero network calls"""
+    latest = cache.latest(aqi_param())
+    data = []
+    for name, lat, lon in cities:
+        aqi = latest.get((round(float(lat), 4), round(float(lon), 4)))
+        if aqi is None:
+            print(f"❌ {name} (not in cache)")
+        else:
+            print(f"💾 {name}: {aqi} (replay)")
+            data.append({"City": name, "AQI": aqi})
+    return data
+
+CHART_FILE = "india_aqi_dashboard_aditya.png"
+DATA_FILE = "india_aqi_live_aditya.csv"
+TOP_N = 15          # Bars on the dashboard
+CHART_DPI = 300     # One-shot export quality
+LIVE_DPI = 100      # Cheaper re-export on every live refresh
+
+def load_rows(cities, replay=False, use_cache=True, cache_ttl=CACHE_TTL):
+    """FETCH stage: live (cached) rows, or replayed rows from the cache"""
+    if replay:
+        return replay_from_cache(cities, AQICache(ttl=cache_ttl))
+    if not use_cache:
+        return fetch(cities)
+    return fetch_with_cache(cities, AQICache(ttl=cache_ttl))
+
+def build_dataframe(rows):
+    """TRANSFORM stage: valid rows sorted worst-first, positions 0..n-1 as index"""
+    df = pd.DataFrame(rows, columns=["City", "AQI"]).dropna(subset=["AQI"])
+    return df.sort_values("AQI", ascending=False, ignore_index=True)
+
 def get_aqi_color(aqi):
-    """US EPA Official Colors: Green=Good → Purple=Very Bad"""
-    if aqi <= 50: return "#00E400"      # Good 🟢
-    elif aqi <= 100: return "#FFFF00"   # Moderate 🟡
-    elif aqi <= 150: return "#FF7E00"   # Sensitive 🟠
-    elif aqi <= 200: return "#FF0000"   # Unhealthy 🔴
-    else: return "#8F3F97"              # Very Bad 🟣
-
-# 🔥 MAIN PROGRAM - Super Fast Parallel Fetching
-print("🌡️  INDI-AIR by Aditya Santosh Adhav | Starting Live Data Fetch...")
-print(f"📍 Monitoring {len(CITIES)} major Indian cities...\n")
-start_time = time.time()
-
-# Fetch all cities simultaneously (10x faster!)
-data = []
-with ThreadPoolExecutor(max_workers=10) as executor:
-    futures = [executor.submit(get_aqi, name, lat, lon) for name, lat, lon in CITIES]
-    for future in futures:
-        result = future.result()
-        if result: 
-            data.append(result)
-
-# Create sorted DataFrame
-df = pd.DataFrame(data).sort_values("AQI", ascending=False)
-print(f"\n✅ COMPLETE! {len(df)} cities | {time.time()-start_time:.1f} seconds")
-
-# 📊 IMPRESSIVE PROFESSIONAL DASHBOARD
-plt.figure(figsize=(14, 10))
-sns.set_style("whitegrid")
-
-# Main Horizontal Bar Chart (Top 15 Polluted Cities)
-colors = [get_aqi_color(row.AQI) for _, row in df.iterrows()]
-bars = sns.barplot(data=df.head(15), x="AQI", y="City", palette=colors)
-
-# Add AQI numbers ON bars (Professional touch)
-for i, row in df.head(15).iterrows():
-    plt.text(row.AQI + 2, i, f'{int(row.AQI)}', va='center', 
-             fontweight='bold', fontsize=11)
-
-# 🚨 RED ALERT BOX - TOP 5 MOST POLLUTED
-top5_text = "\n".join([f"{i+1}. {row.City}: {int(row.AQI)}" 
-                      for i, row in df.head(5).iterrows()])
-plt.text(1.02, 0.98, f"🚨 TOP 5 ALERT:\n{top5_text}", 
-         transform=plt.gca().transAxes, fontsize=12, fontweight='bold',
-         va='top', bbox=dict(boxstyle="round,pad=0.5", facecolor="red", alpha=0.8))
-
-# Professional Titles & Styling
-plt.title("🇮🇳 INDIA REAL-TIME AIR QUALITY DASHBOARD\nTOP 15 MOST POLLUTED CITIES\n" + 
-          time.strftime("Updated: %Y-%m-%d %H:%M IST"), 
-          fontsize=18, fontweight='bold', pad=20)
-plt.xlabel("AQI Level (Higher = WORSE)", fontsize=14, fontweight='bold')
-plt.ylabel("Cities", fontsize=14, fontweight='bold')
-
-# 📋 Health Risk Legend
-colors_legend = ["#00E400", "#FFFF00", "#FF7E00", "#FF0000", "#8F3F97"]
-labels = ["Good (0-50)", "Moderate (51-100)", "Sensitive (101-150)", 
-          "Unhealthy (151-200)", "Very Bad (200+)"]
-plt.legend([Patch(color=c) for c in colors_legend], labels, 
-           title="US EPA Health Risk", loc='lower right', 
-           bbox_to_anchor=(1.0, 0.0), fontsize=10)
-
-# 🎨 Final Polish & Export
-plt.tight_layout()
-plt.savefig("india_aqi_dashboard_aditya.png", dpi=300, bbox_inches='tight', 
-            facecolor='white')
-plt.show()
-
-# 💾 AUTO-SAVE DATA & SUMMARY
-df.to_csv("india_aqi_live_aditya.csv", index=False)
-print("\n" + "="*70)
-print("🎉 DASHBOARD GENERATED SUCCESSFULLY!")
-print("📈 Chart saved: india_aqi_dashboard_aditya.png")
-print("💾 Data saved: india_aqi_live_aditya.csv")
-print("\n🏆 TOP 5 MOST POLLUTED CITIES RIGHT NOW:")
-print(df.head()[['City', 'AQI']].round(0).astype(int).to_string(index=False))
-print("\n👨‍💻 Created by: Aditya Santosh Adhav")
-print("🎓 3rd Year Computer Engineering Student")
-print("="*70)
+    """US EPA Official Colors: Green=Good → Maroon=Hazardous"""
+    return str(categorize(aqi)[2])
+
+def _pyplot(headless):
+    """Import matplotlib only when a chart is actually drawn (fast import, no GUI on servers)"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    sns.set_style("whitegrid")
+    return plt
+
+class AQIDashboard:
+    """RENDER stage: one persistent figure; update() only moves bars, labels & alert box"""
+
+    def __init__(self, top_n=TOP_N, headless=False):
+        self.plt = _pyplot(headless)
+        from matplotlib.patches import Patch
+
+        self.headless = headless
+        self.top_n = top_n
+        self.fig, self.ax = self.plt.subplots(figsize=(14, 10))
+        ax = self.ax
+
+        # Main Horizontal Bar Chart (Top 15 Polluted Cities) - created once, resized later
+        self.bars = ax.barh(range(top_n), [0] * top_n)
+        self.values = [ax.text(0, i, "", va='center', fontweight='bold', fontsize=11)
+                       for i in range(top_n)]
+        ax.set_yticks(range(top_n))
+        ax.set_ylim(top_n - 0.5, -0.5)   # Worst city on top
+
+        # 🚨 RED ALERT BOX - TOP 5 MOST POLLUTED
+        self.alert = ax.text(1.02, 0.98, "", transform=ax.transAxes, fontsize=12,
+                             fontweight='bold', va='top',
+                             bbox=dict(boxstyle="round,pad=0.5", facecolor="red", alpha=0.8))
+
+        # Professional Titles & Styling
+        self.title = ax.set_title("", fontsize=18, fontweight='bold', pad=20)
+        ax.set_xlabel("AQI Level (Higher = WORSE)", fontsize=14, fontweight='bold')
+        ax.set_ylabel("Cities", fontsize=14, fontweight='bold')
+
+        # 📋 Health Risk Legend
+        ax.legend([Patch(color=c) for c in COLORS[:len(LABELS)]], LABELS,
+                  title="US EPA Health Risk", loc='lower right',
+                  bbox_to_anchor=(1.0, 0.0), fontsize=10)
+        self.fig.tight_layout()
+
+    def update(self, df):
+        """Refresh artists in place - no figure/axes rebuild between polls"""
+        top = df.head(self.top_n)
+        aqi = top["AQI"].to_numpy(dtype=float)
+        _, _, colors = categorize(aqi)   # Vectorized: one lookup for every city
+        names = top["City"].tolist()
+
+        for i, (bar, label) in enumerate(zip(self.bars, self.values)):
+            if i < len(aqi):
+                bar.set_width(aqi[i])
+                bar.set_color(colors[i])
+                label.set_position((aqi[i] + 2, i))
+                label.set_text(f"{int(aqi[i])}")
+            else:
+                bar.set_width(0)
+                label.set_text("")
+        self.ax.set_yticklabels(names + [""] * (self.top_n - len(names)))
+        self.ax.set_xlim(0, max(aqi.max() if len(aqi) else 0, 50) * 1.12)
+
+        top5_text = "\n".join(f"{i + 1}. {city}: {int(value)}"
+                              for i, (city, value) in enumerate(zip(names[:5], aqi[:5])))
+        self.alert.set_text(f"🚨 TOP 5 ALERT:\n{top5_text}")
+        self.title.set_text("🇮🇳 INDIA REAL-TIME AIR QUALITY DASHBOARD\n"
+                            f"TOP {self.top_n} MOST POLLUTED CITIES\n"
+                            + time.strftime("Updated: %Y-%m-%d %H:%M IST"))
+
+        if not self.headless:
+            self.fig.canvas.draw_idle()
+            self.fig.canvas.flush_events()
+
+    def save(self, path=CHART_FILE, dpi=CHART_DPI):
+        self.fig.savefig(path, dpi=dpi, bbox_inches='tight', facecolor='white')
+
+    def show(self):
+        if not self.headless:
+            self.plt.show()
+
+def render_spatial(df, cities, headless=False, step=None):
+    """SPATIAL stage: interpolate station AQI over an India grid and save the heatmap"""
+    import aqi_spatial
+
+    coords = pd.DataFrame(cities, columns=["City", "Lat", "Lon"])
+    stations = df.merge(coords, on="City")
+    if stations.empty:
+        print("⚠️  No station data - skipping the heatmap")
+        return
+    grid_lats, grid_lons = aqi_spatial.make_grid(step=step or aqi_spatial.GRID_STEP)
+    grid = aqi_spatial.idw_grid(stations["Lat"], stations["Lon"], stations["AQI"],
+                                grid_lats, grid_lons)
+    aqi_spatial.render_heatmap(grid, grid_lats, grid_lons, stations, headless=headless)
+    print(f"🗺️  Heatmap saved: {aqi_spatial.HEATMAP_FILE} ({grid.size:,} grid cells)")
+
+def save_csv(df, path=DATA_FILE):
+    df.to_csv(path, index=False)
+
+def print_summary(df):
+    print("\n" + "="*70)
+    print("🎉 DASHBOARD GENERATED SUCCESSFULLY!")
+    print(f"📈 Chart saved: {CHART_FILE}")
+    print(f"💾 Data saved: {DATA_FILE}")
+    print("\n🏆 TOP 5 MOST POLLUTED CITIES RIGHT NOW:")
+    top = df.head()
+    print(top.assign(AQI=top['AQI'].round().astype(int))[['City', 'AQI']].to_string(index=False))
+    print("\n👨‍💻 Created by: Aditya Santosh Adhav")
+    print("🎓 3rd Year Computer Engineering Student")
+    print("="*70)
+
+def resolve_dns(url=None):
+    """Time the API hostname lookup on its own, so DNS stalls are not blamed on the API"""
+    host = urlparse(url or API_URL).hostname
+    with METRICS.stage("dns"):
+        try:
+            socket.getaddrinfo(host, 443)
+        except OSError as error:
+            print(f"⚠️  DNS lookup for {host} failed ({error})")
+
+def export_metrics(json_path=None, prom_path=None):
+    if json_path:
+        METRICS.to_json(json_path)
+    if prom_path:
+        METRICS.to_prometheus(prom_path)
+
+def poll_forever(cities, interval, store, cache=None, dashboard=None, metrics_paths=(None, None)):
+    """Daemon mode: fetch every `interval` seconds, append to the store, refresh the live chart"""
+    print(f"🔁 Polling {len(cities)} cities every {interval}s → {store.directory}/ (Ctrl+C to stop)")
+    if dashboard and not dashboard.headless:
+        dashboard.plt.ion()
+        dashboard.plt.show(block=False)
+    try:
+        while True:
+            started = time.time()
+            resolve_dns()
+            with METRICS.stage("fetch"):
+                rows = fetch_with_cache(cities, cache) if cache else fetch(cities)
+            with METRICS.stage("dataframe"):
+                df = build_dataframe(rows)
+            if len(df):
+                with METRICS.stage("store"):
+                    stored = store.append(df)
+                print(f"📦 {time.strftime('%H:%M:%S')} stored {stored} readings")
+                if dashboard:
+                    with METRICS.stage("plot"):
+                        dashboard.update(df)
+                        dashboard.save(dpi=LIVE_DPI)
+            export_metrics(*metrics_paths)
+            remaining = max(0, interval - (time.time() - started))
+            if dashboard and not dashboard.headless:
+                dashboard.plt.pause(remaining)   # Keeps the window responsive while waiting
+            else:
+                time.sleep(remaining)
+    except KeyboardInterrupt:
+        print("\n🛑 Polling stopped.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="INDI-AIR live AQI dashboard")
+    parser.add_argument("--replay", action="store_true",
+                        help="rebuild data & dashboard from the on-disk cache (no network)")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch fresh data")
+    parser.add_argument("--cache-ttl", type=int, default=CACHE_TTL,
+                        help=f"seconds a cached value stays fresh (default {CACHE_TTL})")
+    parser.add_argument("--poll", type=int, metavar="SECONDS",
+                        help="keep running: poll every SECONDS and append to the history store")
+    parser.add_argument("--store", default=STORE_DIR,
+                        help=f"history store folder for --poll (default {STORE_DIR})")
+    parser.add_argument("--live", action="store_true",
+                        help="with --poll: keep one dashboard figure updating on every poll")
+    parser.add_argument("--headless", action="store_true",
+                        help="server mode: render with Agg, save the PNG, never open a window")
+    parser.add_argument("--spatial", action="store_true",
+                        help="also render an interpolated AQI heatmap over India")
+    parser.add_argument("--grid-step", type=float, metavar="DEGREES",
+                        help="heatmap grid resolution for --spatial (default 0.05)")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="write per-stage / per-city instrumentation as JSON")
+    parser.add_argument("--prometheus", metavar="PATH",
+                        help="write the same metrics in Prometheus text format (.prom)")
+    parser.add_argument("--local-aqi", action="store_true",
+                        help="fetch hourly pollutants and compute the US AQI locally (EPA tables)")
+    args = parser.parse_args(argv)
+    global LOCAL_AQI
+    LOCAL_AQI = args.local_aqi
+    metrics_paths = (args.metrics_json, args.prometheus)
+
+    if args.poll:
+        dashboard = AQIDashboard(headless=args.headless) if args.live else None
+        poll_forever(CITIES, args.poll, AQIStore(args.store),
+                     None if args.no_cache else AQICache(ttl=args.cache_ttl), dashboard,
+                     metrics_paths)
+        return
+
+    # 🔥 Super Fast Parallel Fetching
+    print("🌡️  INDI-AIR by Aditya Santosh Adhav | Starting Live Data Fetch...")
+    print(f"📍 Monitoring {len(CITIES)} major Indian cities...\n")
+    start_time = time.time()
+
+    try:   # Metrics are written even when a stage below fails
+        if not args.replay:
+            resolve_dns()
+        with METRICS.stage("fetch"):
+            rows = load_rows(CITIES, args.replay, not args.no_cache, args.cache_ttl)
+        with METRICS.stage("dataframe"):
+            df = build_dataframe(rows)
+        print(f"\n✅ COMPLETE! {len(df)} cities | {time.time()-start_time:.1f} seconds")
+
+        # 📊 IMPRESSIVE PROFESSIONAL DASHBOARD
+        with METRICS.stage("plot"):
+            dashboard = AQIDashboard(headless=args.headless)
+            dashboard.update(df)
+            dashboard.save()
+        dashboard.show()   # Before anything below can fail, like the original script
+
+        if args.spatial:
+            with METRICS.stage("spatial"):
+                render_spatial(df, CITIES, args.headless, args.grid_step)
+
+        # 💾 AUTO-SAVE DATA & SUMMARY
+        with METRICS.stage("csv"):
+            save_csv(df)
+        print_summary(df)
+    finally:
+        METRICS.report()
+        export_metrics(*metrics_paths)
+
+if __name__ == "__main__":
+    main()